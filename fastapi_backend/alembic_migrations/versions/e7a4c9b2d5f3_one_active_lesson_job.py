@@ -0,0 +1,37 @@
+"""one active lesson job per lesson
+
+Revision ID: e7a4c9b2d5f3
+Revises: 8b3e6f0d2c71
+Create Date: 2026-10-16 18:05:27.640193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a4c9b2d5f3'
+down_revision: Union[str, None] = '8b3e6f0d2c71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep only the newest active job of each lesson so the index can be built
+    op.execute("""
+        UPDATE lesson_jobs SET status = 'failed', error = 'Superseded by a newer render of the lesson'
+        WHERE status IN ('queued', 'running') AND id NOT IN (
+            SELECT DISTINCT ON (lesson_id) id FROM lesson_jobs
+            WHERE status IN ('queued', 'running')
+            ORDER BY lesson_id, created_at DESC
+        )
+    """)
+    op.create_index('ix_lesson_jobs_one_active_per_lesson', 'lesson_jobs', ['lesson_id'], unique=True,
+                    postgresql_where=sa.text("status IN ('queued', 'running')"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_lesson_jobs_one_active_per_lesson', table_name='lesson_jobs',
+                  postgresql_where=sa.text("status IN ('queued', 'running')"))
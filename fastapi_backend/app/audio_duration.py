@@ -0,0 +1,205 @@
+"""
+In-process duration readers for the MP3 and ADTS AAC streams Hume returns.
+
+Both formats are a plain sequence of self-describing frames, so the length can be
+read from the headers alone without decoding any audio or forking ffprobe. MP4 and
+M4A files, the segments rendered from them, store their length in the movie header.
+The MP3 frame helpers are also used by app.audio_join to join clips frame by frame.
+"""
+import struct
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+ADTS_SAMPLE_RATES = (96000, 88200, 64000, 48000, 44100, 32000, 24000, 22050, 16000, 12000, 11025, 8000, 7350)
+ADTS_SAMPLES_PER_BLOCK = 1024
+
+# kbps by (is MPEG-1, layer), indexed by the 4-bit bitrate field (0 = free format, 15 = invalid)
+MP3_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Sample rates by the 2-bit version field: MPEG-2.5, reserved, MPEG-2, MPEG-1
+MP3_SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+
+MP4_BOX_HEADER = struct.Struct(">I4s")
+
+
+def skip_id3v2(data: bytes) -> int:
+    """Return the offset of the first byte after any leading ID3v2 tags."""
+    offset = 0
+    while data[offset:offset + 3] == b"ID3" and len(data) >= offset + 10:
+        size_bytes = data[offset + 6:offset + 10]
+        # Sizes are "syncsafe": 7 bits per byte so the tag never contains a frame sync
+        size = (size_bytes[0] << 21) | (size_bytes[1] << 14) | (size_bytes[2] << 7) | size_bytes[3]
+        has_footer = data[offset + 5] & 0x10
+        offset += 10 + size + (10 if has_footer else 0)
+    return offset
+
+
+def adts_duration(data: bytes, offset: int = 0) -> Optional[float]:
+    """Sum the raw data blocks of every ADTS frame; None if the stream isn't ADTS."""
+    end = len(data)
+    samples = 0
+    sample_rate = None
+    while offset + 7 <= end:
+        if data[offset] != 0xFF or data[offset + 1] & 0xF6 != 0xF0:
+            break
+        sample_rate_index = (data[offset + 2] >> 2) & 0x0F
+        frame_length = ((data[offset + 3] & 0x03) << 11) | (data[offset + 4] << 3) | (data[offset + 5] >> 5)
+        if sample_rate_index >= len(ADTS_SAMPLE_RATES) or frame_length < 7:
+            break
+        if sample_rate is None:
+            sample_rate = ADTS_SAMPLE_RATES[sample_rate_index]
+        samples += ((data[offset + 6] & 0x03) + 1) * ADTS_SAMPLES_PER_BLOCK
+        offset += frame_length
+
+    if sample_rate is None:
+        return None
+    return samples / sample_rate
+
+
+def mp3_frame_info(data: bytes, offset: int) -> Optional[Tuple[int, int, int, int, int]]:
+    """Decode the MPEG audio header at offset into (version, layer, sample rate, samples, frame length), or None."""
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[offset + 1] >> 3) & 0x03
+    layer = 4 - ((data[offset + 1] >> 1) & 0x03)
+    bitrate_index = data[offset + 2] >> 4
+    sample_rate_index = (data[offset + 2] >> 2) & 0x03
+    padding = (data[offset + 2] >> 1) & 0x01
+    # Reserved version/layer/sample rate, and free-format or invalid bitrates
+    if version == 1 or layer == 4 or sample_rate_index == 3 or bitrate_index in (0, 15):
+        return None
+
+    is_mpeg1 = version == 3
+    sample_rate = MP3_SAMPLE_RATES[version][sample_rate_index]
+    bitrate = MP3_BITRATES[(is_mpeg1, layer)][bitrate_index] * 1000
+    if layer == 1:
+        samples = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if is_mpeg1 or layer == 2 else 576
+        frame_length = samples // 8 * bitrate // sample_rate + padding
+    return version, layer, sample_rate, samples, frame_length
+
+
+def mp3_vbr_header_frames(data: bytes, offset: int, version: int, layer: int) -> Optional[int]:
+    """Frame count from a Xing/Info or VBRI header in the first frame, if it has one."""
+    if layer != 3:
+        return None
+    mono = (data[offset + 3] >> 6) == 3
+    if version == 3:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+
+    xing = offset + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info") and len(data) >= xing + 12:
+        flags = int.from_bytes(data[xing + 4:xing + 8], "big")
+        if flags & 0x01:
+            return int.from_bytes(data[xing + 8:xing + 12], "big")
+
+    # Fraunhofer's VBRI header always sits 32 bytes after the frame header
+    vbri = offset + 36
+    if data[vbri:vbri + 4] == b"VBRI" and len(data) >= vbri + 18:
+        return int.from_bytes(data[vbri + 14:vbri + 18], "big")
+    return None
+
+
+def mp3_duration(data: bytes, offset: int = 0) -> Optional[float]:
+    """
+    Duration of an MPEG audio stream; None if no frame sync is found at offset.
+
+    Uses the frame count of a Xing/Info or VBRI header when the encoder wrote one,
+    otherwise walks every frame header and sums the samples.
+    """
+    first = mp3_frame_info(data, offset)
+    if first is None:
+        return None
+    version, layer, sample_rate, samples, _ = first
+
+    frame_count = mp3_vbr_header_frames(data, offset, version, layer)
+    if frame_count is not None:
+        return frame_count * samples / sample_rate
+
+    total_samples = 0
+    while True:
+        info = mp3_frame_info(data, offset)
+        # Stop at the end, a trailing ID3v1/APE tag, or anything that changes the stream layout
+        if info is None or info[:3] != first[:3] or offset + info[4] > len(data):
+            break
+        total_samples += info[3]
+        offset += info[4]
+    if not total_samples:
+        return None
+    return total_samples / sample_rate
+
+
+def read_audio_duration(audio_path: Union[str, Path]) -> Optional[float]:
+    """Duration in seconds of an MP3 or ADTS AAC file, or None for any other format."""
+    with open(audio_path, "rb") as f:
+        data = f.read()
+    offset = skip_id3v2(data)
+
+    # ADTS checks the stricter sync (layer bits 00), which MPEG audio never uses
+    duration = adts_duration(data, offset)
+    if duration is None:
+        duration = mp3_duration(data, offset)
+    return duration
+
+
+def _read_mp4_box(f, end: int):
+    """Read the box header at the file position and return (type, end of box), or None past end."""
+    start = f.tell()
+    header = f.read(MP4_BOX_HEADER.size)
+    if len(header) < MP4_BOX_HEADER.size or start + MP4_BOX_HEADER.size > end:
+        return None
+    size, box_type = MP4_BOX_HEADER.unpack(header)
+    payload = start + MP4_BOX_HEADER.size
+    if size == 1:  # 64-bit size follows the type
+        large_size = f.read(8)
+        if len(large_size) < 8:
+            return None
+        size = int.from_bytes(large_size, "big")
+        payload += 8
+    elif size == 0:  # runs to the end of the file
+        size = end - start
+    if size < payload - start or start + size > end:
+        return None
+    return box_type, start + size
+
+
+def read_mp4_duration(path: Union[str, Path]) -> Optional[float]:
+    """
+    Duration in seconds from the movie header (moov/mvhd) of an MP4 or M4A file, or None
+    if it has none. Only box headers are read; the media data is skipped over.
+    """
+    with open(path, "rb") as f:
+        end = f.seek(0, 2)
+        f.seek(0)
+        parent_end = end
+        in_moov = False
+        while True:
+            box = _read_mp4_box(f, parent_end)
+            if box is None:
+                return None
+            box_type, box_end = box
+            if box_type == b"moov" and not in_moov:
+                parent_end = box_end  # descend into the movie box
+                in_moov = True
+                continue
+            if box_type == b"mvhd" and in_moov:
+                header = f.read(32)
+                version = header[:1]
+                if version == b"\x01" and len(header) == 32:
+                    timescale, duration = struct.unpack(">IQ", header[20:32])
+                elif version == b"\x00" and len(header) >= 20:
+                    timescale, duration = struct.unpack(">II", header[12:20])
+                else:
+                    return None
+                return duration / timescale if timescale else None
+            f.seek(box_end)
@@ -0,0 +1,70 @@
+"""
+Join MP3 clips into one stream with silence between them, without re-encoding.
+
+MPEG audio frames are independent of any file header, so clips from the same encoder
+settings concatenate frame by frame. Gaps are made of silent frames: a frame whose
+side information and main data are all zero decodes to silence in every layer.
+"""
+from typing import List, Optional, Tuple
+
+from app.audio_duration import mp3_frame_info, mp3_vbr_header_frames, skip_id3v2
+
+
+def mp3_frames(data: bytes) -> Optional[Tuple[bytes, bytes]]:
+    """
+    The audio frames of an MP3 file, without ID3v2 tags, the Xing/Info/VBRI header frame
+    or trailing ID3v1/APE tags, plus the 4-byte header of its first frame. None if the
+    data doesn't start with an MPEG audio stream.
+    """
+    offset = skip_id3v2(data)
+    first = mp3_frame_info(data, offset)
+    if first is None:
+        return None
+    version, layer = first[:2]
+    # The header frame counts only this clip's frames, so it would be wrong once joined
+    if mp3_vbr_header_frames(data, offset, version, layer) is not None:
+        offset += first[4]
+
+    start = offset
+    header = data[offset:offset + 4]
+    while True:
+        info = mp3_frame_info(data, offset)
+        if info is None or info[:3] != first[:3] or offset + info[4] > len(data):
+            break
+        offset += info[4]
+    if offset == start:
+        return None
+    return data[start:offset], header
+
+
+def stream_layout(header: bytes) -> Tuple[int, int, int, int]:
+    """Version, layer, sample rate and channel mode of a frame header; the bitrate may vary."""
+    return (*mp3_frame_info(header, 0)[:3], header[3] >> 6)
+
+
+def silent_frames(header: bytes, seconds: float) -> bytes:
+    """Silent frames matching a frame header's layout, rounded to the nearest whole frame."""
+    # No CRC and no padding byte, so every frame is the same length and needs no checksum
+    silent_header = bytes([header[0], header[1] | 0x01, header[2] & ~0x02 & 0xFF, header[3]])
+    _, _, sample_rate, samples, frame_length = mp3_frame_info(silent_header, 0)
+    count = round(seconds * sample_rate / samples)
+    return (silent_header + bytes(frame_length - 4)) * count
+
+
+def join_mp3(clips: List[bytes], gap_seconds: float) -> bytes:
+    """
+    Concatenate MP3 clips with gap_seconds of silence between consecutive clips.
+
+    Clips must share a sample rate and channel layout, as clips from one TTS voice do;
+    if any clip isn't a plain MP3 stream they are simply concatenated. The encoder delay
+    of each clip (a few dozen milliseconds) stays in, on top of the gap.
+    """
+    if len(clips) == 1:
+        return clips[0]
+
+    streams = [mp3_frames(clip) for clip in clips]
+    if any(stream is None for stream in streams) or len({stream_layout(header) for _, header in streams}) > 1:
+        return b"".join(clips)
+
+    gap = silent_frames(streams[0][1], gap_seconds)
+    return gap.join(frames for frames, _ in streams)
@@ -0,0 +1,78 @@
+import binascii
+import string
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+# Characters of base64 text decoded per step; a multiple of 4 so chunks split on whole quads
+CHUNK_CHARS = 1024 * 1024
+
+_STRIP_WHITESPACE = str.maketrans("", "", string.whitespace)
+
+
+def _payload_start(data_b64: str) -> int:
+    """Index where the base64 payload starts, skipping a `data:<type>;base64,` prefix."""
+    if data_b64.startswith("data:"):
+        # The header is short; don't scan (or copy) the whole payload looking for the comma
+        comma = data_b64.find(",", 0, 256)
+        if comma != -1:
+            return comma + 1
+    return 0
+
+
+def iter_base64_chunks(data_b64: str, chunk_chars: int = CHUNK_CHARS) -> Iterator[bytes]:
+    """
+    Decode base64 text piece by piece, yielding the decoded bytes of each chunk.
+
+    Tolerates a data URI prefix, whitespace and line breaks anywhere, and missing
+    trailing padding. Only one chunk of text and bytes is held at a time, never a
+    cleaned-up copy of the whole string.
+    """
+    pending = ""
+    for start in range(_payload_start(data_b64), len(data_b64), chunk_chars):
+        pending += data_b64[start:start + chunk_chars].translate(_STRIP_WHITESPACE)
+        whole = len(pending) - len(pending) % 4
+        if whole:
+            yield binascii.a2b_base64(pending[:whole])
+            pending = pending[whole:]
+
+    if pending:
+        yield binascii.a2b_base64(pending + "=" * (-len(pending) % 4))
+
+
+def detect_media_suffix(head: bytes) -> Optional[str]:
+    """Guess a file suffix from the first bytes of an image or audio file, or None if unknown."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return ".gif"
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return ".webp"
+    if head.startswith(b"RIFF") and head[8:12] == b"WAVE":
+        return ".wav"
+    if head.startswith(b"OggS"):
+        return ".ogg"
+    if head.startswith(b"fLaC"):
+        return ".flac"
+    if head[4:8] == b"ftyp":
+        return ".mp4"
+    if head.startswith(b"ID3"):
+        return ".mp3"
+    if len(head) >= 2 and head[0] == 0xFF:
+        # ADTS AAC has layer bits 00, which MPEG audio frames never use
+        if head[1] & 0xF6 == 0xF0:
+            return ".aac"
+        if head[1] & 0xE0 == 0xE0:
+            return ".mp3"
+    return None
+
+
+def write_base64_file(data_b64: str, path: Union[str, Path]) -> int:
+    """Decode base64 text into a file chunk by chunk; returns the number of bytes written."""
+    written = 0
+    with open(path, "wb") as f:
+        for chunk in iter_base64_chunks(data_b64):
+            f.write(chunk)
+            written += len(chunk)
+    return written
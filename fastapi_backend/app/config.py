@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from typing import Set
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -44,6 +45,54 @@ class Settings(BaseSettings):
     VIDEO_UPLOAD_DIR: str = "uploaded_videos"
     MAX_VIDEO_SIZE: int = 500 * 1024 * 1024  # 500MB in bytes
 
+    # Scenario rendering
+    TTS_MAX_CONCURRENCY: int = 8  # parallel TTS requests per scenario
+    RENDER_MAX_WORKERS: int = os.cpu_count() or 1  # segments encoded in parallel
+    RENDER_GROUP_MAX_SEGMENTS: int = 8  # segments sharing an image that one ffmpeg run writes
+    LESSON_JOB_MAX_CONCURRENCY: int = 2  # lessons rendered at the same time
+    RENDER_WORKSPACE_DIR: str | None = None  # scratch space for renders, e.g. /dev/shm/edupulse-render
+    RENDER_WORKSPACE_QUOTA_BYTES: int = 2 * 1024 * 1024 * 1024  # 2GB in bytes per job
+    DEFAULT_ENCODER_PROFILE: str = "standard"  # draft, standard or final
+    RENDITIONS_ENABLED: bool = False  # also write smaller 360p/540p segments under videos/<rendition>/
+    FFMPEG_MAX_CONCURRENCY: int = os.cpu_count() or 1  # ffmpeg/ffprobe processes running at once
+    FFMPEG_TIMEOUT_SECONDS: float = 600  # kill a single ffmpeg run after this long, 0 for no limit
+
+    # Hume TTS client
+    HUME_API_KEY: str | None = None
+    HUME_BASE_URL: str | None = None  # defaults to api.hume.ai; point at a local fake for benchmarks
+    TTS_HTTP_MAX_CONNECTIONS: int = 16  # pooled keep-alive connections to Hume shared by the whole process
+    TTS_HTTP_KEEPALIVE_SECONDS: float = 60  # idle time before a pooled connection is closed
+    TTS_CONNECT_TIMEOUT_SECONDS: float = 10
+    TTS_REQUEST_TIMEOUT_SECONDS: float = 120  # a long line can take a while to synthesize
+    TTS_BATCH_MAX_UTTERANCES: int = 5  # consecutive lines synthesized by one Hume request
+    TTS_BATCH_MAX_CHARS: int = 1000  # text per batched request, so one slow batch can't hold up a render
+    TTS_SPLIT_LONG_LINES: bool = False  # synthesize long lines sentence by sentence, in parallel
+    TTS_SPLIT_MIN_CHARS: int = 400  # lines at least this long are split at sentence boundaries
+    TTS_SPLIT_PIECE_CHARS: int = 200  # whole sentences are regrouped into pieces of about this much text
+    TTS_SPLIT_GAP_MS: int = 250  # silence between the pieces of a split line
+
+    # TTS request scheduling, shared by every render and preview in the process
+    TTS_REQUESTS_PER_SECOND: float = 5  # sustained Hume request rate, 0 for no limit
+    TTS_BURST: int = 10  # requests that may start at once after an idle spell
+    TTS_MAX_IN_FLIGHT: int = 16  # Hume requests running at once across all renders
+    TTS_MAX_RETRIES: int = 5  # per request, on 429, 5xx and connection errors
+    TTS_BACKOFF_BASE_SECONDS: float = 0.5  # first retry waits up to this long, doubling each time
+    TTS_BACKOFF_MAX_SECONDS: float = 30
+
+    # TTS audio cache
+    TTS_CACHE_DIR: str = "cache/tts"
+    TTS_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024  # 1GB in bytes
+
+    # Rendered segment cache
+    SEGMENT_CACHE_DIR: str = "cache/segments"
+    SEGMENT_CACHE_MAX_BYTES: int = 5 * 1024 * 1024 * 1024  # 5GB in bytes
+
+    # HLS packaging
+    HLS_PACKAGING_ENABLED: bool = False  # also write fMP4 HLS playlists under lessons/<id>/hls/
+
+    # Preview images
+    PREVIEWS_ENABLED: bool = True  # posters and thumbnail sprites for rendered lessons and uploaded videos
+
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
     )
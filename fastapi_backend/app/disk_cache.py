@@ -0,0 +1,167 @@
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def link_or_copy(src_path: Union[str, Path], dst_path: Union[str, Path]) -> None:
+    """
+    Publish src_path at dst_path as a hard link, or a copy across filesystems.
+    The destination is swapped in with a rename, so it never points at a half-written file.
+    """
+    dst_path = Path(dst_path)
+    tmp_path = dst_path.with_name(f".{uuid.uuid4().hex}.tmp")
+    try:
+        try:
+            os.link(src_path, tmp_path)
+        except OSError:
+            shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, dst_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+class DiskLRUCache:
+    """
+    Content-addressed file cache on local disk with a byte budget.
+
+    Entries are stored as `<directory>/<key[:2]>/<key><suffix>`. Reads bump the
+    file's mtime so eviction can drop the least recently used entries first
+    once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int, suffix: str = ""):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size_bytes: Optional[int] = None
+
+    @staticmethod
+    def make_key(*parts: Union[str, bytes]) -> str:
+        """Hash the given parts into a cache key; parts are length-prefixed so they can't run together."""
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode("utf-8")
+            digest.update(len(part).to_bytes(8, "big"))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the path of a cached entry and mark it as recently used, or None on a miss."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Return the contents of a cached entry, or None on a miss."""
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:  # evicted between lookup and read
+            return None
+
+    def put_bytes(self, key: str, data: bytes) -> Path:
+        """Store `data` under `key` and return the entry's path."""
+        return self._store(key, lambda tmp_path: tmp_path.write_bytes(data))
+
+    def put_file(self, key: str, src_path: Union[str, Path], link: bool = False) -> Path:
+        """
+        Copy an existing file into the cache under `key` and return the entry's path.
+        With link=True the entry is hard-linked to src_path when both are on the same filesystem;
+        src_path must then never be modified in place.
+        """
+        def write(tmp_path: Path):
+            if link:
+                try:
+                    os.link(src_path, tmp_path)
+                    return
+                except OSError:
+                    pass
+            shutil.copyfile(src_path, tmp_path)
+
+        return self._store(key, write)
+
+    def _store(self, key: str, write) -> Path:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write next to the final path and rename, so readers never see a partial entry
+        tmp_path = path.with_name(f".{uuid.uuid4().hex}.tmp")
+        try:
+            write(tmp_path)
+            size = tmp_path.stat().st_size
+            # Replace under the lock, so the size of an entry being overwritten is taken off exactly once
+            with self._lock:
+                try:
+                    replaced_size = path.stat().st_size
+                except FileNotFoundError:
+                    replaced_size = 0
+                os.replace(tmp_path, path)
+                if self._size_bytes is not None:
+                    self._size_bytes += size - replaced_size
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        self.evict()
+        return path
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            if self._size_bytes is not None and self._size_bytes <= self.max_bytes:
+                return
+
+            entries = []
+            for path in self.directory.glob(f"*/*{self.suffix}"):
+                if path.name.startswith("."):
+                    continue  # in-flight write
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+            self._size_bytes = total
+
+    def stats(self) -> Dict[str, int]:
+        if self._size_bytes is None:
+            self.evict()  # measures the cache on first use
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size_bytes": self._size_bytes or 0,
+                "max_bytes": self.max_bytes,
+            }
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_pagination import add_pagination
@@ -8,13 +10,33 @@ from app.routes.lesson import router as lesson_router
 from app.routes.ttimage import router as ttimage_router
 from app.routes.tts import router as tts_router
 from app.routes.videos import router as videos_router
+from app.scenario.jobs import resume_lesson_jobs
+from app.tts_client import close_tts_client, create_tts_client
+from app.workspace import cleanup_orphaned_workspaces
 from .schemas import UserCreate, UserRead, UserUpdate
 from .users import auth_backend, fastapi_users, AUTH_URL_PATH
 from .utils import simple_generate_unique_route_id
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Every TTS request of the process shares one pooled client
+    create_tts_client()
+
+    # Clear scratch files of renders that crashed, then pick up interrupted renders
+    removed = cleanup_orphaned_workspaces()
+    if removed:
+        print(f"Removed {removed} orphaned render workspaces")
+    await resume_lesson_jobs()
+    yield
+
+    await close_tts_client()
+
+
 app = FastAPI(
     generate_unique_id_function=simple_generate_unique_route_id,
     openapi_url=settings.OPENAPI_URL,
+    lifespan=lifespan,
 )
 
 # Middleware for CORS configuration
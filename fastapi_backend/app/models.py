@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import List, Optional
 
 from fastapi_users.db import SQLAlchemyBaseUserTableUUID
-from sqlalchemy import String, Integer, ForeignKey, DateTime, ARRAY, Column
+from sqlalchemy import String, Integer, ForeignKey, DateTime, ARRAY, Column, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -49,6 +49,9 @@ class Lesson(Base):
     title: Mapped[str] = mapped_column(String, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    # Encoder profile of the rendered segments, also the default for the next render
+    encoder_profile: Mapped[str] = mapped_column(String, nullable=False, default="standard", server_default="standard")
+
     # Link to the user who created this lesson
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
     user: Mapped["User"] = relationship("User", back_populates="lessons")
@@ -103,3 +106,34 @@ class LessonScenarioDB(Base):
     scenario_json = Column(JSONB, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# Name of the partial unique index that allows one queued or running job per lesson
+ONE_ACTIVE_JOB_INDEX = "ix_lesson_jobs_one_active_per_lesson"
+
+
+class LessonJob(Base):
+    """A background render of a lesson's scenario into video segments."""
+    __tablename__ = "lesson_jobs"
+    __table_args__ = (
+        # Renders of the same lesson would race on its segment files, so at most one may be active
+        Index(ONE_ACTIVE_JOB_INDEX, "lesson_id", unique=True,
+              postgresql_where=text("status IN ('queued', 'running')")),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    lesson_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("lessons.id", ondelete="CASCADE"), nullable=False)
+
+    # queued -> running -> succeeded | failed
+    status: Mapped[str] = mapped_column(String, nullable=False, default="queued")
+    segments_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    segments_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[Optional[str]] = mapped_column(String)
+    encoder_profile: Mapped[str] = mapped_column(String, nullable=False, default="standard", server_default="standard")
+
+    # Scenario to render, and the one it replaces so unchanged segments can be reused
+    scenario_json = Column(JSONB, nullable=False)
+    previous_scenario_json = Column(JSONB, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,99 @@
+import math
+import os
+from pathlib import Path
+from typing import List, Tuple, Union
+
+from PIL import Image
+
+from app.ffmpeg_cmds import get_media_duration, run_ffmpeg
+
+POSTER_WIDTH = 480
+POSTER_HEIGHT = 270
+TILE_WIDTH = 160
+TILE_HEIGHT = 90
+SPRITE_COLUMNS = 10
+SPRITE_MAX_TILES = 100  # long videos get one tile every duration / SPRITE_MAX_TILES seconds
+SPRITE_MIN_INTERVAL = 2.0  # seconds between tiles of short videos
+JPEG_QUALITY = 75
+
+POSTER_NAME = "poster.jpg"
+SPRITE_NAME = "sprite.jpg"
+SPRITE_VTT_NAME = "sprite.vtt"
+
+PREVIEW_MEDIA_TYPES = {
+    ".jpg": "image/jpeg",
+    ".vtt": "text/vtt",
+}
+
+
+def format_vtt_timestamp(seconds: float) -> str:
+    millis = round(seconds * 1000)
+    hours, millis = divmod(millis, 3600 * 1000)
+    minutes, millis = divmod(millis, 60 * 1000)
+    return f"{hours:02d}:{minutes:02d}:{millis // 1000:02d}.{millis % 1000:03d}"
+
+
+def tile_position(index: int) -> Tuple[int, int]:
+    """Top-left corner of the index-th tile of a sprite sheet, filled row by row."""
+    row, column = divmod(index, SPRITE_COLUMNS)
+    return column * TILE_WIDTH, row * TILE_HEIGHT
+
+
+def write_sprite_vtt(path: Union[str, Path], sprite_name: str, cues: List[Tuple[float, float]]) -> None:
+    """
+    Write the WebVTT index of a sprite sheet: the n-th (start, end) cue shows the n-th
+    tile. Players resolve sprite_name relative to the .vtt, so both are served side by side.
+    """
+    lines = ["WEBVTT", ""]
+    for index, (start, end) in enumerate(cues):
+        x, y = tile_position(index)
+        lines += [
+            f"{format_vtt_timestamp(start)} --> {format_vtt_timestamp(end)}",
+            f"{sprite_name}#xywh={x},{y},{TILE_WIDTH},{TILE_HEIGHT}",
+            "",
+        ]
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+
+
+def write_sprite_sheet(tiles: List[Image.Image], path: Union[str, Path]) -> None:
+    """Paste TILE_WIDTH x TILE_HEIGHT tiles into one JPEG, SPRITE_COLUMNS per row."""
+    rows = max(1, math.ceil(len(tiles) / SPRITE_COLUMNS))
+    columns = min(len(tiles), SPRITE_COLUMNS) or 1
+    sheet = Image.new("RGB", (columns * TILE_WIDTH, rows * TILE_HEIGHT), (0, 0, 0))
+    for index, tile in enumerate(tiles):
+        sheet.paste(tile, tile_position(index))
+    sheet.save(path, "JPEG", quality=JPEG_QUALITY)
+
+
+async def make_video_previews(video_path: str, output_dir: str) -> None:
+    """
+    Write the poster, thumbnail sprite sheet and sprite WebVTT index of a video to
+    output_dir. The video is decoded once; the poster is the frame at a tenth of the
+    duration, past any fade-in, and the sheet has a tile every few seconds.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    duration = await get_media_duration(video_path)
+    interval = max(duration / SPRITE_MAX_TILES, SPRITE_MIN_INTERVAL)
+    tiles = max(1, math.ceil(duration / interval))
+    columns = min(tiles, SPRITE_COLUMNS)
+    rows = math.ceil(tiles / SPRITE_COLUMNS)
+
+    fit_tile = (f"scale={TILE_WIDTH}:{TILE_HEIGHT}:force_original_aspect_ratio=decrease,"
+                f"pad={TILE_WIDTH}:{TILE_HEIGHT}:(ow-iw)/2:(oh-ih)/2")
+    filters = ";".join([
+        "[0:v]split=2[p][s]",
+        f"[p]trim=start={duration / 10:.3f},scale={POSTER_WIDTH}:-2[poster]",
+        f"[s]fps=1/{interval:.3f},{fit_tile},tile={columns}x{rows}[sprite]",
+    ])
+    await run_ffmpeg([
+        "ffmpeg",
+        "-y",
+        "-i", video_path,
+        "-filter_complex", filters,
+        "-map", "[poster]", "-frames:v", "1", "-q:v", "4", os.path.join(output_dir, POSTER_NAME),
+        "-map", "[sprite]", "-frames:v", "1", "-q:v", "4", os.path.join(output_dir, SPRITE_NAME),
+    ])
+
+    cues = [(index * interval, min((index + 1) * interval, duration)) for index in range(tiles)]
+    write_sprite_vtt(os.path.join(output_dir, SPRITE_VTT_NAME), SPRITE_NAME, cues)
@@ -0,0 +1,111 @@
+import asyncio
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.config import settings
+
+STDERR_TAIL_BYTES = 64 * 1024
+
+# Limits how many ffmpeg/ffprobe processes run at the same time across every render in this process
+_process_slots = asyncio.Semaphore(settings.FFMPEG_MAX_CONCURRENCY)
+
+
+class ProcessResult(BaseModel):
+    returncode: int
+    stdout: bytes = b""
+    stderr: str = ""  # only the last STDERR_TAIL_BYTES
+
+
+class ProcessError(RuntimeError):
+    def __init__(self, cmd: List[str], message: str, stderr: str = ""):
+        detail = f"{Path(cmd[0]).name} {message}"
+        if stderr:
+            detail += f": {stderr[-500:]}"  # show only the end of the log
+        super().__init__(detail)
+        self.cmd = cmd
+        self.stderr = stderr
+
+
+class ProcessTimeout(ProcessError):
+    pass
+
+
+async def _read_tail(stream: asyncio.StreamReader, limit: int) -> bytes:
+    """Drain a pipe, keeping only its last `limit` bytes so a chatty process can't grow memory."""
+    tail = bytearray()
+    while chunk := await stream.read(64 * 1024):
+        tail += chunk
+        del tail[:-limit]
+    return bytes(tail)
+
+
+async def _write_stdin(stream: asyncio.StreamWriter, data: bytes) -> None:
+    try:
+        stream.write(data)
+        await stream.drain()
+        stream.close()
+    except (BrokenPipeError, ConnectionResetError):
+        pass  # the process exited early; its exit status and stderr say why
+
+
+async def _kill(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+    # Reap it so no zombie is left behind, even if we're being cancelled again
+    await asyncio.shield(process.wait())
+
+
+async def run_process(
+        cmd: List[str],
+        timeout: Optional[float] = None,
+        capture_stdout: bool = False,
+        stderr_limit: int = STDERR_TAIL_BYTES,
+        input: Optional[bytes] = None,
+) -> ProcessResult:
+    """
+    Run a command without blocking the event loop and wait for it to finish.
+
+    At most FFMPEG_MAX_CONCURRENCY commands run at once; the rest wait for a slot.
+    The process is killed if it outlives `timeout` seconds (FFMPEG_TIMEOUT_SECONDS
+    by default, 0 for no limit) or if the awaiting task is cancelled.
+    `input` is written to the process's stdin, e.g. raw frames for `-i pipe:0`.
+    Raises ProcessError on a non-zero exit status and ProcessTimeout on a timeout.
+    """
+    timeout = settings.FFMPEG_TIMEOUT_SECONDS if timeout is None else timeout
+
+    async with _process_slots:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=subprocess.DEVNULL if input is None else subprocess.PIPE,
+            stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            async with asyncio.timeout(timeout or None):
+                stdout, stderr, _ = await asyncio.gather(
+                    process.stdout.read() if capture_stdout else asyncio.sleep(0, b""),
+                    _read_tail(process.stderr, stderr_limit),
+                    _write_stdin(process.stdin, input) if input is not None else asyncio.sleep(0),
+                )
+                await process.wait()
+        except TimeoutError:
+            await _kill(process)
+            raise ProcessTimeout(cmd, f"timed out after {timeout}s")
+        except BaseException:
+            await _kill(process)
+            raise
+
+    result = ProcessResult(
+        returncode=process.returncode,
+        stdout=stdout,
+        stderr=stderr.decode("utf-8", errors="replace"),
+    )
+    if result.returncode != 0:
+        raise ProcessError(cmd, "failed", result.stderr)
+    return result
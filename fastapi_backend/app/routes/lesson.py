@@ -1,19 +1,25 @@
+import re
 from pathlib import Path
 from typing import Literal, List, Optional
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, APIRouter, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from starlette import status
 
 from app.database import get_async_session as get_db
-from app.models import Lesson, LessonVideo, Video, Breakpoint, User, LessonScenarioDB
-from app.scenario.generate_scenario import generate_scenario
+from app.ffmpeg_cmds import EncoderProfileName, RENDITION_LADDER
+from app.models import Lesson, LessonJob, LessonVideo, Video, Breakpoint, User, LessonScenarioDB, ONE_ACTIVE_JOB_INDEX
+from app.previews import PREVIEW_MEDIA_TYPES
+from app.scenario.jobs import JOB_QUEUED, JOB_RUNNING, create_lesson_job
+from app.scenario.progress import format_sse, render_progress
 from app.schema_models.scenario import Scenario
-from app.schemas import LessonCreate, LessonRead, LessonVideoAddResponse, LessonVideoRead, LessonListResponse
+from app.schemas import (LessonCreate, LessonJobRead, LessonRead, LessonVideoAddResponse, LessonVideoRead,
+                         LessonListResponse)
 from app.users import current_active_user
 
 router = APIRouter(tags=["lessons"])
@@ -75,51 +81,54 @@ async def create_lesson(lesson: LessonCreate, db: AsyncSession = Depends(get_db)
     return new_lesson
 
 
-@router.post("/upload_scenario", response_model=LessonRead)
+ENCODER_PROFILE_DESCRIPTION = "Encoder profile: 'draft' for fast previews, 'standard', or 'final' for small published files"
+
+
+@router.post("/upload_scenario", response_model=LessonJobRead, status_code=status.HTTP_202_ACCEPTED)
 async def upload_scenario(scenario: Scenario,
+                          encoder_profile: Optional[EncoderProfileName] = Query(
+                              None, description=ENCODER_PROFILE_DESCRIPTION),
                           db: AsyncSession = Depends(get_db),
                           user: User = Depends(current_active_user)):
-    new_lesson = await create_lesson(LessonCreate(title=scenario.title, user_id=user.id), db)
-    video_paths = await generate_scenario(scenario, new_lesson.id)
-    await save_scenario_json(scenario=scenario, lesson_id=new_lesson.id, session=db)
-
-    LessonVideo(lesson_id=new_lesson.id, )
+    """
+    Create a lesson from a scenario and queue the rendering of its video segments.
 
-    return new_lesson
+    Returns the render job immediately; poll GET /lessons/jobs/{job_id} for progress.
+    """
+    new_lesson = await create_lesson(LessonCreate(title=scenario.title, user_id=user.id), db)
+    return await queue_lesson_job(new_lesson.id, scenario, db, encoder_profile=encoder_profile)
 
 
-@router.put("/{lesson_id}", response_model=LessonRead)
-async def update_lesson(
-        lesson_id: UUID,
-        scenario: Scenario,
+@router.get("/jobs/{job_id}", response_model=LessonJobRead)
+async def get_lesson_job(
+        job_id: UUID,
         db: AsyncSession = Depends(get_db),
         user: User = Depends(current_active_user)
 ):
-    """
-    Update an existing lesson by replacing its scenario and regenerating all video segments.
-
-    This endpoint:
-    1. Validates that the lesson exists and belongs to the current user
-    2. Deletes all existing video segments from disk
-    3. Updates the lesson title if changed
-    4. Regenerates all video segments based on the new scenario
-    5. Updates the scenario JSON in the database
+    """Report the state of a lesson render job and how many of its segments are done."""
+    result = await db.execute(
+        select(LessonJob)
+        .join(Lesson, Lesson.id == LessonJob.lesson_id)
+        .where(LessonJob.id == job_id, Lesson.user_id == user.id)
+    )
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job not found: {job_id}"
+        )
+    return job
 
-    Args:
-        lesson_id: UUID of the lesson to update
-        scenario: New scenario structure with script blocks, breakpoints, and branch options
-        db: Database session dependency
-        user: Current authenticated user
 
-    Returns:
-        Updated lesson information
+async def get_renderable_lesson(lesson_id: UUID, user: User, db: AsyncSession) -> Lesson:
+    """
+    Load a lesson the user is about to re-render.
 
     Raises:
         404: If lesson not found
         403: If user doesn't own the lesson
-        500: If video generation or file deletion fails
+        409: If the lesson is already being rendered
     """
-    # 1. Check that the lesson exists and belongs to the user
     lesson_result = await db.execute(
         select(Lesson).where(Lesson.id == lesson_id)
     )
@@ -138,66 +147,138 @@ async def update_lesson(
             detail="You don't have permission to update this lesson"
         )
 
-    # 2. Delete all existing video segments from disk
-    videos_dir = Path.cwd() / "lessons" / str(lesson_id) / "videos"
-
-    if videos_dir.exists():
-        try:
-            # Delete all video files in the directory
-            for video_file in videos_dir.glob("segment_*.mp4"):
-                video_file.unlink()
-                print(f"Deleted: {video_file}")
+    # Renders of the same lesson would race on its segment files
+    active_job_result = await db.execute(
+        select(LessonJob).where(
+            LessonJob.lesson_id == lesson_id,
+            LessonJob.status.in_([JOB_QUEUED, JOB_RUNNING])
+        )
+    )
+    if active_job_result.scalars().first():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This lesson is still being rendered"
+        )
 
-            # Optionally delete the entire videos directory and recreate it
-            # shutil.rmtree(videos_dir)
-            # videos_dir.mkdir(parents=True, exist_ok=True)
+    return lesson
 
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error deleting existing video segments: {str(e)}"
-            )
 
-    # 3. Update the lesson title if it changed
-    if lesson.title != scenario.title:
-        lesson.title = scenario.title
-        await db.commit()
-        await db.refresh(lesson)
+async def queue_lesson_job(
+        lesson_id: UUID,
+        scenario: Scenario,
+        db: AsyncSession,
+        previous: Optional[Scenario] = None,
+        encoder_profile: Optional[str] = None,
+) -> LessonJob:
+    """
+    Queue a render job for the lesson, committing any pending changes to the lesson with it.
 
-    # 4. Regenerate all video segments using the new scenario
+    Raises:
+        409: If another render of the lesson was queued first. The database allows one
+             active job per lesson, which also settles requests racing past get_renderable_lesson.
+    """
     try:
-        video_paths = await generate_scenario(scenario, lesson_id)
-    except Exception as e:
+        return await create_lesson_job(lesson_id, scenario, db, previous=previous, encoder_profile=encoder_profile)
+    except IntegrityError as e:
+        await db.rollback()
+        if ONE_ACTIVE_JOB_INDEX not in str(e.orig):
+            raise
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error generating video segments: {str(e)}"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This lesson is still being rendered"
         )
 
-    # 5. Update the scenario JSON in the database
-    # First, delete the old scenario record
-    old_scenario_result = await db.execute(
+
+async def get_saved_scenario(lesson_id: UUID, db: AsyncSession) -> Optional[Scenario]:
+    result = await db.execute(
         select(LessonScenarioDB).where(LessonScenarioDB.lesson_id == lesson_id)
     )
-    old_scenario = old_scenario_result.scalar_one_or_none()
+    record = result.scalar_one_or_none()
+    return Scenario.model_validate(record.scenario_json) if record else None
 
-    if old_scenario:
-        await db.delete(old_scenario)
-        await db.commit()
 
-    # Save the new scenario
-    await save_scenario_json(scenario=scenario, lesson_id=lesson_id, session=db)
+@router.put("/{lesson_id}", response_model=LessonJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def update_lesson(
+        lesson_id: UUID,
+        scenario: Scenario,
+        encoder_profile: Optional[EncoderProfileName] = Query(
+            None, description=f"{ENCODER_PROFILE_DESCRIPTION}; defaults to the lesson's current profile"),
+        db: AsyncSession = Depends(get_db),
+        user: User = Depends(current_active_user)
+):
+    """
+    Update an existing lesson by replacing its scenario and queueing a re-render of the video segments that changed.
 
-    return lesson
+    This endpoint:
+    1. Validates that the lesson exists and belongs to the current user
+    2. Rejects the update while another render of the lesson is still in progress
+    3. Updates the lesson title if changed
+    4. Queues a render job that re-renders only the segments whose dialogue, voice
+       or image changed, keeping (and renumbering) the unchanged segment files.
+       Changing the encoder profile re-renders every segment.
+       The scenario JSON is replaced once the job succeeds.
 
+    Args:
+        lesson_id: UUID of the lesson to update
+        scenario: New scenario structure with script blocks, breakpoints, and branch options
+        encoder_profile: Encoder profile to render with, the lesson's current one if omitted
+        db: Database session dependency
+        user: Current authenticated user
 
-async def save_scenario_json(scenario: Scenario, lesson_id: UUID, session: AsyncSession):
-    record = LessonScenarioDB(
-        lesson_id=lesson_id,
-        scenario_json=scenario.dict()
-    )
-    session.add(record)
-    await session.commit()
-    return record.id
+    Returns:
+        The queued render job; poll GET /lessons/jobs/{job_id} for progress
+
+    Raises:
+        404: If lesson not found
+        403: If user doesn't own the lesson
+        409: If the lesson is already being rendered
+    """
+    # 1-2. Check that the lesson exists, belongs to the user and isn't being rendered
+    lesson = await get_renderable_lesson(lesson_id, user, db)
+
+    # The previous scenario lets the job reuse unchanged segments
+    previous = await get_saved_scenario(lesson_id, db)
+
+    # 3. Update the lesson title if it changed; saved together with the job, so a
+    #    request that loses the race for the render leaves the title alone too
+    encoder_profile = encoder_profile or lesson.encoder_profile
+    if lesson.title != scenario.title:
+        lesson.title = scenario.title
+
+    # 4. Queue the render
+    return await queue_lesson_job(lesson_id, scenario, db, previous=previous, encoder_profile=encoder_profile)
+
+
+@router.post("/{lesson_id}/render", response_model=LessonJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def rerender_lesson(
+        lesson_id: UUID,
+        encoder_profile: EncoderProfileName = Query(..., description=ENCODER_PROFILE_DESCRIPTION),
+        db: AsyncSession = Depends(get_db),
+        user: User = Depends(current_active_user)
+):
+    """
+    Queue a re-render of the lesson's saved scenario with another encoder profile,
+    e.g. to publish a lesson that was authored with draft renders.
+
+    Example:
+        POST /lessons/{lesson_id}/render?encoder_profile=final
+
+    Raises:
+        404: If the lesson or its scenario is not found
+        403: If user doesn't own the lesson
+        409: If the lesson is already being rendered
+    """
+    await get_renderable_lesson(lesson_id, user, db)
+
+    scenario = await get_saved_scenario(lesson_id, db)
+    if not scenario:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Scenario not found for lesson: {lesson_id}"
+        )
+
+    # Same profile: the job finds nothing changed and keeps every segment
+    return await queue_lesson_job(lesson_id, scenario, db, previous=scenario, encoder_profile=encoder_profile)
 
 
 @router.post("/{lesson_id}/add_video", response_model=LessonVideoAddResponse)
@@ -306,11 +387,18 @@ async def has_next_video(lesson_id: UUID, index: int, db: AsyncSession = Depends
     return {"has_next": next_exists}
 
 
+SEGMENT_MEDIA_TYPES = {
+    ".mp4": "video/mp4",
+    ".m4a": "audio/mp4",
+}
+
+
 # Helper function to resolve segment file path
 def resolve_segment_file_path(
         lesson_id: UUID,
         segment_number: int,
-        segment_type: Optional[str] = None
+        segment_type: Optional[str] = None,
+        rendition: Optional[str] = None,
 ) -> str:
     """
     Resolve the video file path based on lesson_id, segment_number, and segment_type.
@@ -319,9 +407,12 @@ def resolve_segment_file_path(
         lesson_id: UUID of the lesson
         segment_number: The segment number (1-indexed)
         segment_type: The branch type (e.g., "option_A", "option_B") or None for main segments
+        rendition: Name of a smaller rendition (e.g., "360p") or None for the full-size segment
 
     Returns:
-        Absolute path to the video file
+        Absolute path to the video file, or to the .m4a of an audio-only segment.
+        A rendition that wasn't rendered (disabled, or no smaller than the lesson's
+        encoder profile) falls back to the full-size segment.
 
     Raises:
         HTTPException if the file doesn't exist
@@ -332,20 +423,48 @@ def resolve_segment_file_path(
     # Construct filename based on segment type
     if segment_type and segment_type != "main":
         # Branch segment: segment_{branch_type}_{number:03d}.mp4
-        filename = f"segment_{segment_type}_{segment_number:03d}.mp4"
+        stem = f"segment_{segment_type}_{segment_number:03d}"
     else:
         # Main segment: segment_main_{number:03d}.mp4
-        filename = f"segment_main_{segment_number:03d}.mp4"
+        stem = f"segment_main_{segment_number:03d}"
 
-    file_path = base_dir / filename
+    # Renditions live in a directory of their own next to the full-size segments
+    search_dirs = [base_dir / rendition, base_dir] if rendition else [base_dir]
 
-    if not file_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Video file not found: {filename}"
-        )
+    # Segments without an image are rendered audio-only
+    for directory in search_dirs:
+        for suffix in SEGMENT_MEDIA_TYPES:
+            file_path = directory / f"{stem}{suffix}"
+            if file_path.exists():
+                return str(file_path)
+
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Video file not found: {stem}.mp4"
+    )
 
-    return str(file_path)
+
+async def get_current_scenario_json(lesson_id: UUID, db: AsyncSession) -> Optional[dict]:
+    """
+    The lesson's saved scenario JSON or, for a new lesson whose first render is still in
+    progress, the scenario of that render, so the player can fetch segments as they're encoded.
+    None if the lesson has neither.
+    """
+    result = await db.execute(
+        select(LessonScenarioDB.scenario_json).where(LessonScenarioDB.lesson_id == lesson_id)
+    )
+    scenario_json = result.scalar_one_or_none()
+    if scenario_json is not None:
+        return scenario_json
+
+    # The scenario is saved once a job succeeds
+    result = await db.execute(
+        select(LessonJob.scenario_json).where(
+            LessonJob.lesson_id == lesson_id,
+            LessonJob.status.in_([JOB_QUEUED, JOB_RUNNING])
+        )
+    )
+    return result.scalars().first()
 
 
 # Helper function to validate segment exists in scenario JSON
@@ -356,7 +475,8 @@ async def validate_segment_in_scenario(
         db: AsyncSession
 ) -> bool:
     """
-    Validate that the requested segment exists in the lesson's scenario JSON.
+    Validate that the requested segment exists in the lesson's scenario JSON, or in the
+    scenario of its first render while that render is in progress (see get_current_scenario_json).
 
     Args:
         lesson_id: UUID of the lesson
@@ -370,13 +490,7 @@ async def validate_segment_in_scenario(
     Raises:
         HTTPException if lesson or segment doesn't exist
     """
-    # Query the scenario JSON from database
-    result = await db.execute(
-        select(LessonScenarioDB).where(LessonScenarioDB.lesson_id == lesson_id)
-    )
-    scenario_record = result.scalar_one_or_none()
-
-    if not scenario_record:
+    if await get_current_scenario_json(lesson_id, db) is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Lesson scenario not found for lesson_id: {lesson_id}"
@@ -431,12 +545,9 @@ async def get_lesson_scenario(
         )
 
     # Query the scenario JSON
-    result = await db.execute(
-        select(LessonScenarioDB).where(LessonScenarioDB.lesson_id == lesson_id)
-    )
-    scenario_record = result.scalar_one_or_none()
+    scenario_json = await get_current_scenario_json(lesson_id, db)
 
-    if not scenario_record:
+    if scenario_json is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Lesson scenario not found for lesson_id: {lesson_id}"
@@ -445,16 +556,60 @@ async def get_lesson_scenario(
     return {
         "lesson_id": lesson_id,
         "title": lesson.title,
-        "scenario": scenario_record.scenario_json
+        "scenario": scenario_json
     }
 
 
+@router.get("/{lesson_id}/render/events")
+async def stream_render_events(
+        lesson_id: UUID,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream progress of the lesson's current render as server-sent events.
+
+    Each event is named after its stage (render_queued, render_started, segment_reused,
+    line_synthesized, tts_finished, segment_encoded, render_finished, render_failed) and carries
+    a JSON payload with the segment it refers to and the stage timing in elapsed_ms. Events
+    already emitted by a queued or running render are replayed first; the stream closes when
+    the render ends.
+
+    Example:
+        GET /lessons/{lesson_id}/render/events
+    """
+    lesson_result = await db.execute(
+        select(Lesson).where(Lesson.id == lesson_id)
+    )
+    if not lesson_result.scalar_one_or_none():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Lesson not found: {lesson_id}"
+        )
+
+    async def event_stream():
+        async for event in render_progress.subscribe(str(lesson_id), keepalive_interval=15):
+            if event is None:
+                yield ": keep-alive\n\n"  # stops proxies from closing an idle stream
+            else:
+                yield format_sse(event)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
 @router.get("/{lesson_id}/segment")
 async def stream_video_segment(
         lesson_id: UUID,
         segment_number: int = Query(..., ge=1, description="The segment number (1-indexed)"),
         segment_type: Optional[str] = Query(None,
                                             description="Branch type (e.g., 'option_A', 'option_B') or None for main segments"),
+        rendition: Optional[str] = Query(None, description="Smaller rendition (e.g., '360p') or None for full size"),
         db: AsyncSession = Depends(get_db)
 ):
     """
@@ -464,12 +619,16 @@ async def stream_video_segment(
     1. Validates the lesson exists in the database
     2. Validates the segment exists in the lesson's scenario JSON
     3. Resolves the video file path on disk
-    4. Streams the MP4 file to the client
+    4. Streams the MP4 file to the client, or an M4A (audio/mp4) for segments without an
+       image; the X-Segment-Media header says "video" or "audio" so the player can show a
+       placeholder instead of an empty frame
 
     Args:
         lesson_id: UUID of the lesson
         segment_number: The segment number to retrieve (1-indexed)
         segment_type: Optional branch identifier (e.g., "option_A", "option_B")
+        rendition: Optional smaller rendition for slow connections (e.g., "360p", "540p");
+            served at full size when the lesson has no such rendition
         db: Database session dependency
 
     Returns:
@@ -477,12 +636,19 @@ async def stream_video_segment(
 
     Raises:
         404: If lesson, segment, or video file not found
-        400: If segment_number is invalid
+        400: If segment_number or rendition is invalid
 
     Example:
         GET /lessons/{lesson_id}/segment?segment_number=1
         GET /lessons/{lesson_id}/segment?segment_number=3&segment_type=option_A
+        GET /lessons/{lesson_id}/segment?segment_number=1&rendition=360p
     """
+    if rendition and rendition not in {known.name for known in RENDITION_LADDER}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown rendition: {rendition}"
+        )
+
     # 1. Check that the lesson exists
     lesson_result = await db.execute(
         select(Lesson).where(Lesson.id == lesson_id)
@@ -504,7 +670,7 @@ async def stream_video_segment(
 
     # 3. Resolve the video file path
     try:
-        video_path = resolve_segment_file_path(lesson_id, segment_number, segment_type)
+        video_path = resolve_segment_file_path(lesson_id, segment_number, segment_type, rendition)
     except HTTPException:
         raise
     except Exception as e:
@@ -520,11 +686,86 @@ async def stream_video_segment(
             while chunk := file_like.read(65536):  # 64KB chunks
                 yield chunk
 
+    suffix = Path(video_path).suffix
     return StreamingResponse(
         iterfile(),
-        media_type="video/mp4",
+        media_type=SEGMENT_MEDIA_TYPES[suffix],
         headers={
-            "Content-Disposition": f"inline; filename=segment_{segment_number}.mp4",
-            "Accept-Ranges": "bytes"
+            "Content-Disposition": f"inline; filename=segment_{segment_number}{suffix}",
+            "Accept-Ranges": "bytes",
+            "X-Segment-Media": SEGMENT_MEDIA_TYPES[suffix].split("/")[0],
         }
     )
+
+
+HLS_MEDIA_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".m4s": "video/iso.segment",
+    ".mp4": "video/mp4",
+}
+HLS_NAME_PATTERN = re.compile(r"^[\w.-]+$")
+
+
+@router.get("/{lesson_id}/hls/{track}/{filename}")
+async def get_hls_file(lesson_id: UUID, track: str, filename: str):
+    """
+    Serve the HLS playlists and fMP4 fragments of a lesson.
+
+    Each track ("main" or a branch type such as "option_A") has a playlist.m3u8 that
+    references its init sections and .m4s fragments by relative name. The files are
+    static, so nginx or a CDN can serve lessons/<id>/hls/ directly instead.
+
+    Example:
+        GET /lessons/{lesson_id}/hls/main/playlist.m3u8
+        GET /lessons/{lesson_id}/hls/option_A/playlist.m3u8
+    """
+    suffix = Path(filename).suffix
+    if (not HLS_NAME_PATTERN.match(track) or not HLS_NAME_PATTERN.match(filename)
+            or track.startswith(".") or suffix not in HLS_MEDIA_TYPES):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid HLS file name"
+        )
+
+    file_path = Path.cwd() / "lessons" / str(lesson_id) / "hls" / track / filename
+    if not file_path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"HLS file not found: {track}/{filename}"
+        )
+
+    # Playlists change on re-render; fragments are replaced together with them
+    cache_control = "no-cache" if suffix == ".m3u8" else "public, max-age=3600"
+    return FileResponse(file_path, media_type=HLS_MEDIA_TYPES[suffix], headers={"Cache-Control": cache_control})
+
+
+@router.get("/{lesson_id}/previews/{filename}")
+async def get_lesson_preview(lesson_id: UUID, filename: str):
+    """
+    Serve the preview images of a rendered lesson, so lesson lists don't fetch any video.
+
+    Each segment with an image has a poster named after it (segment_main_001.jpg), and each
+    track ("main" or a branch type) has a thumbnail sprite sheet with a WebVTT index for
+    scrubbing, one tile per segment. The VTT references the sheet by relative name.
+
+    Example:
+        GET /lessons/{lesson_id}/previews/segment_main_001.jpg
+        GET /lessons/{lesson_id}/previews/main_sprite.vtt
+    """
+    suffix = Path(filename).suffix
+    if not HLS_NAME_PATTERN.match(filename) or filename.startswith(".") or suffix not in PREVIEW_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid preview file name"
+        )
+
+    file_path = Path.cwd() / "lessons" / str(lesson_id) / "previews" / filename
+    if not file_path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Preview not found: {filename}"
+        )
+
+    # Rewritten on re-render; browsers revalidate with the ETag/Last-Modified FileResponse sends
+    return FileResponse(file_path, media_type=PREVIEW_MEDIA_TYPES[suffix],
+                        headers={"Cache-Control": "public, max-age=300"})
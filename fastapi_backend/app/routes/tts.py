@@ -1,16 +1,30 @@
+import asyncio
+import base64
 import os
-from typing import Optional
+import tempfile
+from typing import AsyncGenerator, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Depends
-from hume import HumeClient
-from hume.tts import PostedUtterance
+from fastapi.responses import StreamingResponse
+from hume.tts import FormatMp3, PostedUtterance, ReturnGeneration
 from pydantic import BaseModel, Field
 
+from app.config import settings
 from app.database import User
+from app.disk_cache import DiskLRUCache
+from app.tts_client import get_tts_client
+from app.tts_scheduler import BULK, INTERACTIVE, NO_SDK_RETRIES, tts_scheduler
 from app.users import current_active_user
 
 router = APIRouter(tags=["tts"])
 
+# Bump when the provider, model version or request shape changes so stale audio isn't reused
+TTS_PROVIDER_VERSION = "hume-tts-1"
+
+tts_audio_cache = DiskLRUCache(settings.TTS_CACHE_DIR, settings.TTS_CACHE_MAX_BYTES, suffix=".audio")
+
+STREAM_CHUNK_BYTES = 64 * 1024
+
 
 class TTSRequest(BaseModel):
     text: str = Field(..., description="Text to synthesize into speech")
@@ -47,33 +61,222 @@ async def synthesize_speech(
     if not user:
         raise HTTPException(status_code=401, detail="User not authenticated")
 
-    # Call core synthesis logic
-    return synthesize_with_hume(request)
+    # Call core synthesis logic; an author is waiting, so go ahead of lesson renders
+    return await synthesize_with_hume(request, priority=INTERACTIVE)
+
 
+@router.post("/synthesize/stream")
+async def synthesize_speech_stream(
+        request: TTSRequest,
+        user: User = Depends(current_active_user),
+) -> StreamingResponse:
+    """
+    Stream speech as raw MP3 (audio/mpeg) while Hume generates it.
 
-def synthesize_with_hume(request: TTSRequest) -> TTSResponse:
+    - Playback can start with the first chunk instead of after the whole clip
+    - No base64 inflation, and the server never holds the whole clip in memory
+    - Identical requests replay from the TTS audio cache; X-TTS-Cache says "hit" or "miss"
+    """
+
+    if not user:
+        raise HTTPException(status_code=401, detail="User not authenticated")
+    if request.format != "mp3":
+        raise HTTPException(status_code=400, detail="Streaming is only available for mp3")
+
+    cache_key = tts_cache_key(request)
+    cached_path = await asyncio.to_thread(tts_audio_cache.get, cache_key)
+    if cached_path is not None:
+        try:
+            cached_file = open(cached_path, "rb")
+        except FileNotFoundError:  # evicted between lookup and open
+            pass
+        else:
+            return StreamingResponse(iter_cached_audio(cached_file), media_type="audio/mpeg",
+                                     headers={"X-TTS-Cache": "hit"})
+
+    if not settings.HUME_API_KEY:
+        raise HTTPException(status_code=500, detail="HUME_API_KEY not configured")
+
+    chunks = stream_with_hume(request)
+    # Wait for the first chunk here, so a failing request still gets an error status
+    first_chunk = await anext(chunks, None)
+    if first_chunk is None:
+        raise HTTPException(status_code=502, detail="Hume returned no audio")
+    return StreamingResponse(spool_to_cache(first_chunk, chunks, cache_key), media_type="audio/mpeg",
+                             headers={"X-TTS-Cache": "miss"})
+
+
+def iter_cached_audio(cached_file):
+    with cached_file:
+        while chunk := cached_file.read(STREAM_CHUNK_BYTES):
+            yield chunk
+
+
+async def stream_with_hume(request: TTSRequest) -> AsyncGenerator[bytes, None]:
+    """
+    Yield the audio of one request as Hume produces it. The stream holds an interactive
+    TTS scheduler slot until it ends; it isn't retried, audio already sent can't be taken back.
+    """
+    async with tts_scheduler.slot(INTERACTIVE):
+        async for chunk in get_tts_client().tts.synthesize_file_streaming(
+            utterances=[
+                PostedUtterance(
+                    text=request.text,
+                    description=request.voice_description
+                )
+            ],
+            format=FormatMp3(),
+            num_generations=1,
+            # One header for the whole stream, so the chunks join into the same file the JSON endpoint returns
+            strip_headers=True,
+            version="1",
+            # Instant mode needs a named voice; ours are designed from the description
+            instant_mode=False,
+            request_options=NO_SDK_RETRIES,
+        ):
+            yield chunk
+
+
+async def spool_to_cache(
+        first_chunk: bytes,
+        chunks: AsyncGenerator[bytes, None],
+        cache_key: str,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Pass audio chunks through to the client, spooling them to a temporary file that
+    becomes the cache entry once the stream completes. A stream that fails or is
+    abandoned by the client isn't cached.
+    """
+    fd, spool_path = tempfile.mkstemp(suffix=".audio")
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            chunk = first_chunk
+            while True:
+                yield chunk
+                await asyncio.to_thread(spool.write, chunk)
+                chunk = await anext(chunks, None)
+                if chunk is None:
+                    break
+        await asyncio.to_thread(tts_audio_cache.put_file, cache_key, spool_path, True)
+    finally:
+        await chunks.aclose()  # ends the provider stream and frees its scheduler slot right away
+        os.unlink(spool_path)
+
+
+@router.get("/cache/stats")
+async def get_tts_cache_stats(user: User = Depends(current_active_user)) -> Dict[str, int]:
+    """Hit/miss counters and disk usage of the TTS audio cache."""
+    return tts_audio_cache.stats()
+
+
+def tts_cache_key(request: TTSRequest) -> str:
+    return DiskLRUCache.make_key(
+        request.text, request.voice_description, request.format, TTS_PROVIDER_VERSION
+    )
+
+
+async def synthesize_with_hume(request: TTSRequest, priority: int = BULK) -> TTSResponse:
     """
     Handles the actual Hume.ai TTS request and returns audio data or URL.
+    Identical requests are served from the on-disk audio cache without calling Hume.
+    Requests go through the process-wide client, reusing its pooled connections, and
+    are rate limited and retried by the TTS scheduler in the given priority lane.
+    """
+    return (await synthesize_batch_with_hume([request], priority))[0]
+
+
+def plan_tts_batches(
+        requests: List[TTSRequest],
+        max_utterances: Optional[int] = None,
+        max_chars: Optional[int] = None,
+) -> List[List[int]]:
+    """
+    Group runs of consecutive requests into batches of at most max_utterances requests and
+    max_chars characters of text. Returns the request indexes of each batch, in order.
+    Every request keeps its own voice description, so a batch can mix characters; only a
+    change of audio format starts a new batch.
+    """
+    max_utterances = max_utterances or settings.TTS_BATCH_MAX_UTTERANCES
+    max_chars = max_chars or settings.TTS_BATCH_MAX_CHARS
+
+    batches: List[List[int]] = []
+    batch_chars = 0
+    for index, request in enumerate(requests):
+        batch = batches[-1] if batches else None
+        if (batch is None or len(batch) >= max_utterances or batch_chars + len(request.text) > max_chars
+                or requests[batch[0]].format != request.format):
+            batches.append([index])
+            batch_chars = len(request.text)
+        else:
+            batch.append(index)
+            batch_chars += len(request.text)
+    return batches
+
+
+def split_utterance_audio(generation: ReturnGeneration, count: int) -> List[bytes]:
+    """Reassemble the audio of each of the count utterances of a generation from its snippets, in order."""
+    if count == 1:
+        return [base64.b64decode(generation.audio)]
+
+    parts = [bytearray() for _ in range(count)]
+    for index, snippets in enumerate(generation.snippets):
+        for snippet in snippets:
+            utterance = index if snippet.utterance_index is None else snippet.utterance_index
+            parts[utterance] += base64.b64decode(snippet.audio)
+
+    if not all(parts):
+        raise RuntimeError(f"Hume returned audio for {sum(map(bool, parts))} of {count} utterances")
+    return [bytes(part) for part in parts]
+
+
+async def synthesize_batch_with_hume(requests: List[TTSRequest], priority: int = BULK) -> List[TTSResponse]:
+    """
+    Synthesize several requests with a single Hume call, one utterance each, and split
+    the audio back out per request, in order. Requests already in the audio cache are
+    answered from it and left out of the call. See plan_tts_batches for batch sizes.
+    The call waits for the TTS scheduler, which also retries it on 429/5xx.
     """
+    cache_keys = [tts_cache_key(request) for request in requests]
+    cached_audios = await asyncio.gather(*(asyncio.to_thread(tts_audio_cache.get_bytes, key) for key in cache_keys))
+
+    responses: List[Optional[TTSResponse]] = [
+        TTSResponse(
+            audio_url=base64.b64encode(cached_audio).decode("ascii"),
+            format=request.format,
+            message="Speech served from cache.",
+        ) if cached_audio is not None else None
+        for request, cached_audio in zip(requests, cached_audios)
+    ]
+    missing = [index for index, response in enumerate(responses) if response is None]
+    if not missing:
+        return responses
 
-    api_key = os.getenv("HUME_API_KEY")
-    if not api_key:
+    if not settings.HUME_API_KEY:
         raise HTTPException(status_code=500, detail="HUME_API_KEY not configured")
 
-    client = HumeClient(api_key=api_key)
-    result = client.tts.synthesize_json(
+    result = await tts_scheduler.run(lambda: get_tts_client().tts.synthesize_json(
         utterances=[
             PostedUtterance(
-                text=request.text,
-                description=request.voice_description
+                text=requests[index].text,
+                description=requests[index].voice_description
             )
+            for index in missing
         ],
         num_generations=1,
-        version="1"
-    )
+        # Without per-snippet file headers, any run of snippets joins into one playable file
+        strip_headers=len(missing) > 1,
+        version="1",
+        instant_mode=False,
+        request_options=NO_SDK_RETRIES,
+    ), priority)
 
-    return TTSResponse(
-        audio_url=result.generations[0].audio,
-        format=request.format,
-        message="Speech synthesized successfully. Audio available via URL.",
-    )
+    audios = split_utterance_audio(result.generations[0], len(missing))
+    for index, audio in zip(missing, audios):
+        await asyncio.to_thread(tts_audio_cache.put_bytes, cache_keys[index], audio)
+        responses[index] = TTSResponse(
+            audio_url=base64.b64encode(audio).decode("ascii"),
+            format=requests[index].format,
+            message="Speech synthesized successfully. Audio available via URL.",
+        )
+
+    return responses
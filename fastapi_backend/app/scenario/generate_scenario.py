@@ -1,216 +1,526 @@
+import asyncio
 import base64
+import collections
+import functools
+import itertools
+import json
+import math
 import os
-import subprocess
-import tempfile
-from typing import List, Optional
-
-from PIL import Image
-
-from app.ffmpeg_cmds import make_video
-from app.routes.tts import synthesize_with_hume, TTSRequest
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.audio_join import join_mp3
+from app.config import settings
+from app.disk_cache import DiskLRUCache, file_sha256, link_or_copy
+from app.ffmpeg_cmds import (
+    RENDITION_LADDER,
+    EncoderProfile,
+    Rendition,
+    SegmentOutput,
+    get_encoder_profile,
+    get_renditions,
+    make_still_clips,
+    render_segment_outputs,
+)
+from app.routes.tts import plan_tts_batches, synthesize_batch_with_hume, TTSRequest
 from app.schema_models.scenario import Scenario
-from app.schema_models.scenario import ScriptBlock
-
-
-async def get_b64_audio(block: ScriptBlock, voice_description: str):
-    """
-    Generate audio for a dialogue block using the specified voice description.
-
-    Args:
-        block: ScriptBlock containing dialogue text
-        voice_description: Description of how the character's voice should sound
-    """
-    tts_request = TTSRequest(
-        text=block.dialogue,
-        voice_description=voice_description
-    )
-    response = synthesize_with_hume(tts_request)
-    return response.audio_url
-
-
-def decode_base64_to_file(data_b64: str, suffix: Optional[str] = None) -> str:
-    """Write base64 data to a temporary file and return its path, detecting image/audio type if possible."""
-    # Clean up data URL if included
-    if data_b64.startswith("data:"):
-        header, data_b64 = data_b64.split(",", 1)
-
-    # Auto-detect format
-    header = data_b64[:10]
-    if header.startswith("/9j/"):  # JPEG
-        suffix = suffix or ".jpg"
-    elif header.startswith("iVBORw0K"):  # PNG
-        suffix = suffix or ".png"
-    elif header.startswith("UklGR"):  # WEBP
-        suffix = suffix or ".webp"
-    elif header.startswith("//uUx"):  # MP3
-        suffix = suffix or ".mp3"
-    else:
-        # Fallbacks
-        suffix = suffix or ".bin"
-
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-    tmp.write(base64.b64decode(data_b64))
-    tmp.close()
-    return tmp.name
-
-
-def concat_audio_files(audio_files: List[str], output_path: str):
-    """Use FFmpeg to concatenate audio files."""
-    concat_file = tempfile.NamedTemporaryFile(delete=False, mode="w", suffix=".txt")
-    for f in audio_files:
-        concat_file.write(f"file '{os.path.abspath(f)}'\n")
-    concat_file.close()
-    cmd = [
-        "ffmpeg", "-y", "-f", "concat", "-safe", "0",
-        "-i", concat_file.name, "-c:a", "copy", output_path
-    ]
-    subprocess.run(cmd, check=True)
-    os.remove(concat_file.name)
-
+from app.scenario.hls import package_hls
+from app.scenario.previews import write_lesson_previews
+from app.scenario.progress import render_progress
+from app.scenario.render_scheduler import RenderScheduler
+from app.scenario.segment_plan import PlannedLine, PlannedSegment, plan_segments
+from app.scenario.sentences import split_long_line
+from app.workspace import Workspace
 
-def make_video_segment(image_path: str, audio_path: str, output_path: str):
-    make_video(image_path, audio_path, output_path)
+# Called with (segments_done, segments_total) as rendering progresses
+ProgressCallback = Callable[[int, int], Awaitable[None]]
 
 
-def create_black_image(width=1280, height=720) -> str:
-    """Create a black placeholder image and return its path."""
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-    Image.new("RGB", (width, height), color=(0, 0, 0)).save(tmp.name, "PNG")
-    return tmp.name
+def line_tts_request(line: PlannedLine) -> TTSRequest:
+    return TTSRequest(text=line.dialogue, voice_description=line.voice_description)
 
 
-async def generate_scenario(scenario: Scenario, lesson_id: str):
+async def get_b64_audios(lines: List[PlannedLine]) -> List[str]:
     """
-    Stitch each image+audio group in a scenario into separate video files.
-    Includes support for branch_options after the main script.
-    Uses character voice descriptions from scenario.characters if available.
-    Returns a list of paths to generated video segments.
+    Generate audio for consecutive lines with one TTS request, each line in the voice
+    of its own description. Returns the base64 audio of each line, in order.
     """
+    responses = await synthesize_batch_with_hume([line_tts_request(line) for line in lines])
+    return [response.audio_url for response in responses]
 
-    output_dir = f"{os.path.curdir}/lessons/{lesson_id}/videos/"
-    os.makedirs(output_dir, exist_ok=True)
 
-    # Get character voice descriptions from scenario
-    character_voices = getattr(scenario, "characters", {}) or {}
-    default_voice = "A neutral, clear voice"
+def join_b64_audios(b64_audios: List[str]) -> str:
+    """Join the base64 MP3 audio of the pieces of a split line, with TTS_SPLIT_GAP_MS of silence between them."""
+    audio = join_mp3([base64.b64decode(b64_audio) for b64_audio in b64_audios], settings.TTS_SPLIT_GAP_MS / 1000)
+    return base64.b64encode(audio).decode("ascii")
 
-    print(f"Loaded {len(character_voices)} character voices: {list(character_voices.keys())}")
 
-    # Trackers
-    current_image_b64 = None
-    current_audios = []
+def decode_base64_to_file(data_b64: str, workspace: Workspace, suffix: Optional[str] = None) -> str:
+    """Write base64 data to a file in the workspace and return its path, detecting image/audio type if possible."""
+    return workspace.write_base64(data_b64, suffix or ".bin")
 
-    segment_paths = []
-    main_segment_index = 1  # independent numbering for main script
-    branch_segment_index = {}  # dict: branch_type -> counter
 
-    def get_branch_index(branch_type: str) -> int:
-        """Return and increment the index for this branch type."""
-        if branch_type not in branch_segment_index:
-            branch_segment_index[branch_type] = 1
+# Holds .mp4 segments and still clips as well as .m4a audio-only segments, so entries
+# have no extension of their own; the container is part of each segment's key instead
+segment_cache = DiskLRUCache(settings.SEGMENT_CACHE_DIR, settings.SEGMENT_CACHE_MAX_BYTES)
 
-        idx = branch_segment_index[branch_type]
-        branch_segment_index[branch_type] += 1
-        return idx
 
-    def flush_segment(branch_type: Optional[str]):
-        nonlocal main_segment_index
+def segment_cache_key(
+        output_path: str,
+        image_sha256: str,
+        audio_sha256s: Sequence[str],
+        profile: EncoderProfile,
+) -> str:
+    """Key of a segment written to output_path: its content, encoder settings and container."""
+    return DiskLRUCache.make_key(image_sha256, *audio_sha256s, profile.settings_key(), Path(output_path).suffix)
 
-        if not current_audios:
-            return
 
-        if branch_type:
-            branch_type = branch_type.replace(" ", "-")
+def rendition_path(output_path: str, rendition_name: str) -> str:
+    """Where a rendition of the segment at output_path is written: a directory per rendition."""
+    return os.path.join(os.path.dirname(output_path), rendition_name, os.path.basename(output_path))
 
-        # Pick image
-        if current_image_b64:
-            img_path = decode_base64_to_file(current_image_b64, ".png")
-        else:
-            img_path = create_black_image()
 
-        # Combine audio
-        audio_concat = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3").name
-        concat_audio_files(current_audios, audio_concat)
+async def make_video_segments(
+        image_path: Optional[str],
+        segment_audio_paths: List[List[str]],
+        output_paths: List[str],
+        workspace: Workspace,
+        profile: EncoderProfile,
+        renditions: Sequence[Tuple[Rendition, EncoderProfile]] = (),
+):
+    """
+    Encode segments that share an image, and each of their renditions, reusing previous
+    encodes of the same image, audio and encoder settings. Cached videos are hard-linked
+    (or copied) to their output path; everything else is written by a single ffmpeg run
+    that decodes each segment's audio once for all of its renditions.
+    Without an image the segments are audio-only.
+    """
+    image_sha256 = await asyncio.to_thread(file_sha256, image_path) if image_path else "audio-only"
+    targets = [(profile, None), *((smaller, rendition.name) for rendition, smaller in renditions)]
+
+    to_encode = []
+    for audio_paths, output_path in zip(segment_audio_paths, output_paths):
+        audio_sha256s = await asyncio.gather(*(asyncio.to_thread(file_sha256, path) for path in audio_paths))
+        for target_profile, rendition_name in targets:
+            target_path = rendition_path(output_path, rendition_name) if rendition_name else output_path
+            cache_key = segment_cache_key(output_path, image_sha256, audio_sha256s, target_profile)
+
+            cached_path = segment_cache.get(cache_key)
+            if cached_path:
+                try:
+                    link_or_copy(cached_path, target_path)
+                    continue
+                except FileNotFoundError:
+                    pass  # evicted since the lookup, render it again
+            # ffmpeg picks the container from the extension, so keep the output's
+            rendered_path = workspace.new_path(Path(output_path).suffix)
+            to_encode.append((cache_key, audio_paths, target_path, rendered_path, target_profile))
+
+    if not to_encode:
+        return
+
+    still_clips = {}
+    if image_path:
+        needed = {target_profile.settings_key(): target_profile for *_, target_profile in to_encode}
+        still_clips = await get_still_clips(image_path, image_sha256, workspace, list(needed.values()))
+    await render_segment_outputs([
+        SegmentOutput(audio_paths=audio_paths, output_path=rendered_path, profile=target_profile,
+                      still_clip_path=still_clips.get(target_profile.settings_key()))
+        for _, audio_paths, _, rendered_path, target_profile in to_encode
+    ])
+    for cache_key, _, target_path, rendered_path, _ in to_encode:
+        workspace.add_file(rendered_path)
+        segment_cache.put_file(cache_key, rendered_path, link=True)
+        link_or_copy(rendered_path, target_path)
+
+
+async def get_still_clips(
+        image_path: str,
+        image_sha256: str,
+        workspace: Workspace,
+        profiles: List[EncoderProfile],
+) -> Dict[str, str]:
+    """
+    Return workspace copies of the image's looping still clip for each profile, keyed by
+    the profile's settings_key. Clips no earlier segment (of any lesson) already encoded
+    for this image and profile are encoded together with one ffmpeg run.
+    """
+    clips = {}
+    to_encode = []
+    for profile in profiles:
+        cache_key = DiskLRUCache.make_key("still-clip", image_sha256, profile.settings_key())
+        clip_path = workspace.new_path(".mp4")
+        clips[profile.settings_key()] = clip_path
+
+        cached_path = segment_cache.get(cache_key)
+        if cached_path:
+            try:
+                link_or_copy(cached_path, clip_path)
+                workspace.add_file(clip_path)
+                continue
+            except FileNotFoundError:
+                pass  # evicted since the lookup, encode it again
+        to_encode.append((cache_key, profile, clip_path))
+
+    if to_encode:
+        await make_still_clips(image_path, [(profile, clip_path) for _, profile, clip_path in to_encode])
+        for cache_key, _, clip_path in to_encode:
+            workspace.add_file(clip_path)
+            segment_cache.put_file(cache_key, clip_path, link=True)
+    return clips
+
+
+async def render_segment_group(
+        segments: List[PlannedSegment],
+        segment_b64_audios: List[List[str]],
+        output_paths: List[str],
+        workspace: Workspace,
+        profile: EncoderProfile,
+        renditions: Sequence[Tuple[Rendition, EncoderProfile]] = (),
+):
+    """
+    Decode the image shared by a group of segments once (if they have one), decode each
+    segment's audio, then encode them all, renditions included, with one ffmpeg run.
+    Returns (segment, milliseconds spent rendering the group) for each segment.
+    """
+    started = time.perf_counter()
+
+    # Pick image; decoding is CPU work, keep it off the event loop. Segments without one are audio-only
+    image_b64 = segments[0].image_b64
+    img_path = None
+    if image_b64:
+        img_path = await asyncio.to_thread(decode_base64_to_file, image_b64, workspace, ".png")
+
+    # Reassemble each segment's audio in script order
+    segment_audio_paths = []
+    for segment, b64_audios in zip(segments, segment_b64_audios):
+        audio_files = []
+        for line, b64_audio in zip(segment.lines, b64_audios):
+            audio_path = await asyncio.to_thread(decode_base64_to_file, b64_audio, workspace, ".mp3")
+            audio_files.append(audio_path)
+            print(f"Audio saved to: '{audio_path}' for '{line.role}'")
+        segment_audio_paths.append(audio_files)
+
+    # Concatenate the audio and encode every segment of the group in one ffmpeg run
+    await make_video_segments(img_path, segment_audio_paths, output_paths, workspace, profile, renditions)
+    workspace.check_quota()
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return [(segment, elapsed_ms) for segment in segments]
+
+
+def group_segments_by_image(segments: List[PlannedSegment], max_group_size: int) -> List[List[PlannedSegment]]:
+    """
+    Group segments that show the same image (or none), in plan order, into groups of at
+    most max_group_size so large groups are still spread over several workers.
+    """
+    by_image: Dict[Optional[str], List[PlannedSegment]] = {}
+    for segment in segments:
+        by_image.setdefault(segment.image_b64, []).append(segment)
+
+    return [
+        same_image[start:start + max_group_size]
+        for same_image in by_image.values()
+        for start in range(0, len(same_image), max_group_size)
+    ]
+
 
-        # Filename
-        if branch_type:
-            idx = get_branch_index(branch_type)
-            filename = f"segment_{branch_type}_{idx:03d}.mp4"
+async def synthesize_lines(
+        lines: List[PlannedLine],
+        max_concurrency: Optional[int] = None,
+        on_line_done: Optional[Callable[[int, float], None]] = None,
+) -> List[str]:
+    """
+    Synthesize every planned line, batching runs of consecutive lines into one TTS request
+    (see plan_tts_batches) and sending at most max_concurrency requests at a time. Batches
+    only grow once there are more lines than concurrent requests.
+    With TTS_SPLIT_LONG_LINES, long lines are split at sentence boundaries (see
+    split_long_line) and each piece gets a request of its own in the line's voice, so a
+    monologue is synthesized in parallel; the pieces are joined with TTS_SPLIT_GAP_MS of
+    silence between them.
+    on_line_done is called with the line's index and the synthesis time in milliseconds
+    of the request(s) that carried it.
+
+    Returns the base64 audio for each line in the same order as `lines`.
+    """
+    max_concurrency = max_concurrency or settings.TTS_MAX_CONCURRENCY
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    # Every line becomes one or more pieces; piece_lines maps each piece back to its line
+    pieces: List[PlannedLine] = []
+    piece_lines: List[int] = []
+    for index, line in enumerate(lines):
+        texts = [line.dialogue]
+        if settings.TTS_SPLIT_LONG_LINES:
+            texts = split_long_line(line.dialogue, settings.TTS_SPLIT_MIN_CHARS, settings.TTS_SPLIT_PIECE_CHARS)
+        pieces.extend(line.model_copy(update={"dialogue": text}) if len(texts) > 1 else line for text in texts)
+        piece_lines.extend([index] * len(texts))
+    pieces_left = collections.Counter(piece_lines)
+    split_lines = {line for line, count in pieces_left.items() if count > 1}
+    line_started: Dict[int, float] = {}
+
+    async def synthesize(batch: List[int]) -> List[str]:
+        async with semaphore:
+            for index in batch:
+                print(f"Generating audio for '{pieces[index].role}' with voice: '{pieces[index].voice_description}'")
+            started = time.perf_counter()
+            for index in batch:
+                line_started.setdefault(piece_lines[index], started)
+            b64_audios = await get_b64_audios([pieces[index] for index in batch])
+            for index in batch:
+                line = piece_lines[index]
+                pieces_left[line] -= 1
+                if on_line_done and not pieces_left[line]:
+                    on_line_done(line, (time.perf_counter() - line_started[line]) * 1000)
+            return b64_audios
+
+    # Batch no more than it takes to keep every request slot busy; short scripts stay fully parallel
+    max_utterances = min(settings.TTS_BATCH_MAX_UTTERANCES, math.ceil(len(pieces) / max_concurrency)) or 1
+    batches: List[List[int]] = []
+    for is_split, run in itertools.groupby(range(len(pieces)), key=lambda i: piece_lines[i] in split_lines):
+        run = list(run)
+        if is_split:
+            # Batching the pieces of a split line would put them back into one serial request
+            batches.extend([index] for index in run)
         else:
-            filename = f"segment_main_{main_segment_index:03d}.mp4"
-            main_segment_index += 1
-
-        seg_path = os.path.join(output_dir, filename)
-
-        # Make video
-        make_video_segment(img_path, audio_concat, seg_path)
-        segment_paths.append(seg_path)
-
-    # -------------------------------------------------
-    # Helper to process one DialogueLine-like structure
-    # -------------------------------------------------
-    async def process_dialogue(role, dialogue, image, branch_type: Optional[str]):
-        nonlocal current_image_b64, current_audios
-
-        # Image begins a new segment
-        if image and image.base64:
-            if current_audios:
-                flush_segment(branch_type)
-                current_audios.clear()
-            current_image_b64 = image.base64
-
-        # Generate speech with character-specific voice
-        if dialogue:
-            # Get voice description for this character, or use default
-            voice_description = character_voices.get(role, default_voice)
-
-            if not voice_description or voice_description.strip() == "":
-                voice_description = default_voice
-
-            print(f"Generating audio for '{role}' with voice: '{voice_description}'")
-
-            dummy = ScriptBlock(dialogue=dialogue, image=image)
-            b64_audio = await get_b64_audio(dummy, voice_description)
-            audio_path = decode_base64_to_file(b64_audio, ".mp3")
-            current_audios.append(audio_path)
-            print(f"Audio saved to: '{audio_path}' for '{role}'")
-
-    # -------------------------------------------------
-    # Process MAIN SCRIPT
-    # -------------------------------------------------
-    for block in scenario.script:
-
-        await process_dialogue(block.role, block.dialogue, block.image, None)
-
-        # Breakpoint ends main segment
-        if block.breakpoint:
-            flush_segment(None)
-            current_audios.clear()
+            run_batches = plan_tts_batches([line_tts_request(pieces[index]) for index in run], max_utterances)
+            batches.extend([run[index] for index in batch] for batch in run_batches)
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(synthesize(batch)) for batch in batches]
+
+    line_audios: List[List[str]] = [[] for _ in lines]
+    for line, b64_audio in zip(piece_lines, (b64_audio for task in tasks for b64_audio in task.result())):
+        line_audios[line].append(b64_audio)
+    return [b64_audios[0] if len(b64_audios) == 1 else join_b64_audios(b64_audios) for b64_audios in line_audios]
+
+
+def reuse_unchanged_segments(
+        output_dir: str,
+        segments: List[PlannedSegment],
+        rendered: Dict[str, str],
+        rendition_names: Sequence[str] = (),
+) -> List[PlannedSegment]:
+    """
+    Keep the rendered files of segments whose content didn't change, renaming them
+    if their position moved, and delete every other existing segment file.
+    rendered maps each existing segment file to the fingerprint of its content.
+    A segment is only kept if the file of each rendition in rendition_names is there too.
+
+    Returns the segments that still need to be rendered.
+    """
+    segment_dirs = [output_dir, *(os.path.join(output_dir, name) for name in rendition_names)]
+
+    # fingerprint -> previously rendered files with that content
+    reusable: Dict[str, List[str]] = {}
+    for filename, fingerprint in rendered.items():
+        if all(os.path.exists(os.path.join(directory, filename)) for directory in segment_dirs):
+            reusable.setdefault(fingerprint, []).append(filename)
+
+    # Stage reused files under temporary names first so renumbering can't clobber them
+    staged = []
+    to_render = []
+    for segment in segments:
+        candidates = reusable.get(segment.fingerprint())
+        if not candidates:
+            to_render.append(segment)
             continue
 
-        # -------------------------------------------------
-        # Process BRANCHES on this block
-        # -------------------------------------------------
-        if getattr(block, "branch_options", None):
-            for branch in block.branch_options:
-                current_image_b64 = None
-
-                for line in branch.dialogue:
-                    await process_dialogue(
-                        role=line.role,
-                        dialogue=line.dialogue,
-                        image=line.image,
-                        branch_type=branch.type
-                    )
-
-                # End of branch = flush independently
-                flush_segment(branch.type)
-                current_audios.clear()
-
-    # -------------------------------------------------
-    # Flush trailing main content
-    # -------------------------------------------------
-    flush_segment(None)
+        old_filename = candidates.pop(0)
+        for directory in segment_dirs:
+            staged_path = os.path.join(directory, f".reuse_{segment.filename}")
+            os.replace(os.path.join(directory, old_filename), staged_path)
+            staged.append((staged_path, os.path.join(directory, segment.filename)))
+
+    # Clear every rendition there could be, so none outlives switching it off
+    for directory in [output_dir, *(os.path.join(output_dir, known.name) for known in RENDITION_LADDER)]:
+        for pattern in ("segment_*.mp4", "segment_*.m4a"):
+            for stale in Path(directory).glob(pattern):
+                stale.unlink()
+
+    for staged_path, final_path in staged:
+        os.replace(staged_path, final_path)
+
+    print(f"Reusing {len(segments) - len(to_render)} unchanged segments, rendering {len(to_render)}")
+    return to_render
+
+
+RENDER_MANIFEST = "render.json"
+
+
+def read_render_manifest(output_dir: str) -> Dict[str, object]:
+    """
+    Return what the segment files in output_dir were rendered with, and the fingerprint
+    of each file's content under "segments", or {} if unknown.
+    """
+    try:
+        with open(os.path.join(output_dir, RENDER_MANIFEST)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def write_render_manifest(
+        output_dir: str,
+        profile: EncoderProfile,
+        rendition_names: Sequence[str] = (),
+        segments: Sequence[PlannedSegment] = (),
+) -> None:
+    """Record the settings and the content of segments, the files known to be fully rendered."""
+    manifest_path = os.path.join(output_dir, RENDER_MANIFEST)
+    with open(f"{manifest_path}.tmp", "w") as f:
+        json.dump({
+            "encoder_profile": profile.name,
+            "encoder_settings": profile.settings_key(),
+            "renditions": list(rendition_names),
+            "segments": {segment.filename: segment.fingerprint() for segment in segments},
+        }, f)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+
+def segment_fields(segment: PlannedSegment) -> Dict[str, object]:
+    """Identify a segment in progress events the same way the segment endpoint does."""
+    return {
+        "segment": segment.filename,
+        "segment_type": segment.segment_type,
+        "segment_number": segment.segment_number,
+    }
+
+
+async def generate_scenario(
+        scenario: Scenario,
+        lesson_id: str,
+        previous: Optional[Scenario] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        encoder_profile: Optional[str] = None,
+):
+    """
+    Stitch each image+audio group in a scenario into separate video files.
+    Includes support for branch_options after the main script.
+    Uses character voice descriptions from scenario.characters if available.
+    Only segments whose dialogue, voice or image changed since they were rendered are
+    re-rendered; the others are kept or renumbered. What each file holds is recorded
+    in the render manifest as it is written, so a failed render leaves nothing stale
+    to reuse. previous, the last saved scenario, is only used for files rendered before
+    the manifest recorded their content.
+    Segments are encoded with the named encoder profile, which is recorded next to the
+    files; switching to a different profile re-renders every segment.
+    With RENDITIONS_ENABLED, smaller renditions of every segment are written to
+    output_dir/<rendition>/ by the same ffmpeg runs; renditions that wouldn't be
+    smaller than the profile are skipped and served at full size.
+    on_progress is awaited with (segments_done, segments_total) as segments finish,
+    and per-stage events with timings are published to render_progress.
+    With HLS_PACKAGING_ENABLED, the segments are also packaged as fMP4 HLS playlists.
+    With PREVIEWS_ENABLED, segment posters and per-track thumbnail sprites are written
+    to lessons/<id>/previews/.
+    Returns a list of paths to generated video segments.
+    """
+
+    output_dir = f"{os.path.curdir}/lessons/{lesson_id}/videos/"
+    os.makedirs(output_dir, exist_ok=True)
+
+    character_voices = getattr(scenario, "characters", {}) or {}
+    print(f"Loaded {len(character_voices)} character voices: {list(character_voices.keys())}")
+
+    profile = get_encoder_profile(encoder_profile)
+    segments = plan_segments(scenario)
+    renditions = get_renditions(profile)
+    rendition_names = [rendition.name for rendition, _ in renditions]
+
+    manifest = read_render_manifest(output_dir)
+    rendered = manifest.get("segments")
+    if rendered is None:
+        rendered = {segment.filename: segment.fingerprint() for segment in plan_segments(previous)} if previous else {}
+    # Files encoded with other settings (or without today's renditions) can't be kept alongside the new ones
+    if manifest.get("encoder_settings") != profile.settings_key() or manifest.get("renditions", []) != rendition_names:
+        rendered = {}
+    for name in rendition_names:
+        os.makedirs(os.path.join(output_dir, name), exist_ok=True)
+
+    publish = functools.partial(render_progress.publish, str(lesson_id))
+    started = time.perf_counter()
+    publish("render_started", total=len(segments), encoder_profile=profile.name)
+
+    # Every intermediate file of this render lives here and is removed with it
+    workspace = Workspace(prefix=f"lesson_{lesson_id}")
+    try:
+        # Files are about to be renamed and deleted: until the manifest is rewritten, trust none of them
+        write_render_manifest(output_dir, profile, rendition_names)
+        to_render = reuse_unchanged_segments(output_dir, segments, rendered, rendition_names)
+
+        segments_done = len(segments) - len(to_render)
+        rendering = {segment.filename for segment in to_render}
+        finished = [segment for segment in segments if segment.filename not in rendering]
+        for segment in finished:
+            publish("segment_reused", **segment_fields(segment))
+        # Everything left in output_dir now matches the profile and the new plan
+        write_render_manifest(output_dir, profile, rendition_names, finished)
+
+        async def group_finished(results):
+            nonlocal segments_done
+            for segment, elapsed_ms in results:
+                segments_done += 1
+                finished.append(segment)
+                publish("segment_encoded", **segment_fields(segment), elapsed_ms=elapsed_ms,
+                        done=segments_done, total=len(segments))
+            write_render_manifest(output_dir, profile, rendition_names, finished)
+            if on_progress:
+                await on_progress(segments_done, len(segments))
+
+        if on_progress:
+            await on_progress(segments_done, len(segments))
+
+        # Synthesize the main script and every branch option in one concurrent pass
+        lines = [line for segment in to_render for line in segment.lines]
+        line_segments = [segment for segment in to_render for _ in segment.lines]
+
+        def line_synthesized(index: int, elapsed_ms: float):
+            publish("line_synthesized", **segment_fields(line_segments[index]),
+                    role=lines[index].role, elapsed_ms=elapsed_ms)
+
+        tts_started = time.perf_counter()
+        b64_audios = iter(await synthesize_lines(lines, on_line_done=line_synthesized))
+        publish("tts_finished", lines=len(lines), elapsed_ms=(time.perf_counter() - tts_started) * 1000)
+        audios_by_segment = {segment.filename: [next(b64_audios) for _ in segment.lines] for segment in to_render}
+
+        # Render every changed segment on the worker pool, one ffmpeg run per group of
+        # segments sharing an image; filenames were fixed by the plan
+        scheduler = RenderScheduler(on_complete=group_finished)
+        for group in group_segments_by_image(to_render, settings.RENDER_GROUP_MAX_SEGMENTS):
+            scheduler.submit(
+                render_segment_group,
+                group,
+                [audios_by_segment[segment.filename] for segment in group],
+                [os.path.join(output_dir, segment.filename) for segment in group],
+                workspace,
+                profile,
+                renditions,
+            )
+
+        await scheduler.wait()
+
+        if settings.HLS_PACKAGING_ENABLED:
+            hls_started = time.perf_counter()
+            hls_dir = f"{os.path.curdir}/lessons/{lesson_id}/hls"
+            playlists = await package_hls(output_dir, hls_dir, segments)
+            publish("hls_packaged", tracks=sorted(playlists),
+                    elapsed_ms=(time.perf_counter() - hls_started) * 1000)
+
+        if settings.PREVIEWS_ENABLED:
+            previews_started = time.perf_counter()
+            previews_dir = f"{os.path.curdir}/lessons/{lesson_id}/previews"
+            previews = await write_lesson_previews(output_dir, previews_dir, segments, workspace)
+            publish("previews_written", files=len(previews),
+                    elapsed_ms=(time.perf_counter() - previews_started) * 1000)
+    except Exception as e:
+        publish("render_failed", error=str(e), elapsed_ms=(time.perf_counter() - started) * 1000)
+        raise
+    finally:
+        workspace.cleanup()
+
+    publish("render_finished", total=len(segments), elapsed_ms=(time.perf_counter() - started) * 1000)
+
+    segment_paths = [os.path.join(output_dir, segment.filename) for segment in segments]
 
     print(f"Created {len(segment_paths)} video segments in {output_dir}")
-    return segment_paths
\ No newline at end of file
+    return segment_paths
@@ -0,0 +1,129 @@
+import math
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, List
+
+from app.process_runner import run_process
+from app.scenario.render_scheduler import RenderScheduler
+from app.scenario.segment_plan import PlannedSegment
+
+PLAYLIST_NAME = "playlist.m3u8"
+
+
+async def package_segment(segment_path: str, track_dir: str) -> List[str]:
+    """
+    Repackage one rendered mp4 as fragmented MP4 for HLS without re-encoding.
+
+    Writes `<stem>_init.mp4` and `<stem>_NNN.m4s` into track_dir and returns the
+    playlist lines (map, durations and fragment names) that reference them.
+    """
+    stem = Path(segment_path).stem
+    segment_playlist = os.path.join(track_dir, f"{stem}.m3u8")
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-nostats",  # keep the input's Duration line inside the captured stderr tail
+        "-i", segment_path,
+        "-c", "copy",
+        "-f", "hls",
+        "-hls_segment_type", "fmp4",
+        "-hls_time", "100000",  # one fragment per segment; boundaries stay on segment edges
+        "-hls_playlist_type", "vod",
+        "-hls_flags", "independent_segments",
+        "-hls_fmp4_init_filename", f"{stem}_init.mp4",
+        "-hls_segment_filename", os.path.join(track_dir, f"{stem}_%03d.m4s"),
+        segment_playlist,
+    ]
+    result = await run_process(cmd)
+
+    with open(segment_playlist) as f:
+        lines = [line.strip() for line in f]
+    os.remove(segment_playlist)
+
+    # The muxer measures fragments on video timestamps (1 fps stills), which cuts off
+    # the audio tail; the whole segment is one fragment, so use the input duration
+    duration = re.search(r"Duration: (\d+):(\d+):(\d+\.\d+)", result.stderr)
+    entry = []
+    for line in lines:
+        if line.startswith("#EXTINF") and duration:
+            hours, minutes, seconds = duration.groups()
+            line = f"#EXTINF:{int(hours) * 3600 + int(minutes) * 60 + float(seconds):.6f},"
+        if line.startswith(("#EXT-X-MAP", "#EXTINF")) or (line and not line.startswith("#")):
+            entry.append(line)
+    return entry
+
+
+def write_track_playlist(track_dir: str, entries: List[List[str]]) -> str:
+    """Join the per-segment entries into one VOD playlist, with a discontinuity at every segment edge."""
+    # Each segment has its own init section, timestamps restart at zero in every one
+    durations = [
+        float(line.split(":", 1)[1].rstrip(","))
+        for entry in entries for line in entry if line.startswith("#EXTINF")
+    ]
+
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:7",
+        f"#EXT-X-TARGETDURATION:{math.ceil(max(durations, default=1))}",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+        "#EXT-X-INDEPENDENT-SEGMENTS",
+    ]
+    for i, entry in enumerate(entries):
+        if i:
+            lines.append("#EXT-X-DISCONTINUITY")
+        lines += entry
+    lines.append("#EXT-X-ENDLIST")
+
+    playlist_path = os.path.join(track_dir, PLAYLIST_NAME)
+    tmp_path = f"{playlist_path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, playlist_path)
+    return playlist_path
+
+
+async def package_hls(videos_dir: str, hls_dir: str, segments: List[PlannedSegment]) -> Dict[str, str]:
+    """
+    Package rendered segments as fMP4 HLS: one playlist for the main path and one per branch type.
+
+    The encoded streams are copied, never re-encoded, so the playlists can be served
+    as static files by nginx or a CDN. Returns the playlist path of each track.
+    """
+    tracks: Dict[str, List[PlannedSegment]] = {}
+    for segment in segments:
+        tracks.setdefault(segment.segment_type, []).append(segment)
+
+    # Build next to the live directory and swap it in, so players never see a half-written playlist
+    staging_dir = f"{hls_dir}.new"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+    scheduler = RenderScheduler()
+    for segment_type, track_segments in tracks.items():
+        track_dir = os.path.join(staging_dir, segment_type)
+        os.makedirs(track_dir, exist_ok=True)
+        for segment in track_segments:
+            scheduler.submit(package_segment, os.path.join(videos_dir, segment.filename), track_dir)
+
+    try:
+        entries = iter(await scheduler.wait())
+        for segment_type, track_segments in tracks.items():
+            track_dir = os.path.join(staging_dir, segment_type)
+            write_track_playlist(track_dir, [next(entries) for _ in track_segments])
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    old_dir = f"{hls_dir}.old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(hls_dir):
+        os.rename(hls_dir, old_dir)
+    os.rename(staging_dir, hls_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    return {
+        segment_type: os.path.join(hls_dir, segment_type, PLAYLIST_NAME)
+        for segment_type in tracks
+    }
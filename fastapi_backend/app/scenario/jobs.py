@@ -0,0 +1,126 @@
+import asyncio
+from typing import Optional, Set
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models import Lesson, LessonJob, LessonScenarioDB
+from app.scenario.generate_scenario import generate_scenario
+from app.scenario.progress import render_progress
+from app.schema_models.scenario import Scenario
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+# Limits how many lessons render at the same time in this process
+_job_slots = asyncio.Semaphore(settings.LESSON_JOB_MAX_CONCURRENCY)
+
+# Keep references to running jobs so they aren't garbage collected mid-render
+_running_jobs: Set[asyncio.Task] = set()
+
+
+async def save_scenario_json(scenario: Scenario, lesson_id: UUID, session: AsyncSession):
+    """Store the scenario as the lesson's current scenario, replacing any previous one."""
+    await session.execute(delete(LessonScenarioDB).where(LessonScenarioDB.lesson_id == lesson_id))
+    record = LessonScenarioDB(
+        lesson_id=lesson_id,
+        scenario_json=scenario.dict()
+    )
+    session.add(record)
+    await session.commit()
+    return record.id
+
+
+async def create_lesson_job(
+        lesson_id: UUID,
+        scenario: Scenario,
+        session: AsyncSession,
+        previous: Optional[Scenario] = None,
+        encoder_profile: Optional[str] = None,
+) -> LessonJob:
+    """Persist a queued render job for a lesson and start it in the background."""
+    job = LessonJob(
+        lesson_id=lesson_id,
+        status=JOB_QUEUED,
+        encoder_profile=encoder_profile or settings.DEFAULT_ENCODER_PROFILE,
+        segments_done=0,
+        segments_total=0,
+        scenario_json=scenario.dict(),
+        previous_scenario_json=previous.dict() if previous else None,
+    )
+    session.add(job)
+    await session.commit()
+    await session.refresh(job)
+
+    # Clients subscribing before the job starts must not be replayed the last render's events
+    render_progress.publish(str(lesson_id), "render_queued", job_id=str(job.id))
+    start_lesson_job(job.id)
+    return job
+
+
+def start_lesson_job(job_id: UUID) -> None:
+    task = asyncio.create_task(run_lesson_job(job_id))
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
+
+
+async def run_lesson_job(job_id: UUID) -> None:
+    """Render a job's scenario, recording progress and the outcome on the job row."""
+    async with _job_slots, async_session_maker() as session:
+        job = await session.get(LessonJob, job_id)
+        if not job or job.status not in (JOB_QUEUED, JOB_RUNNING):
+            return
+
+        scenario = Scenario.model_validate(job.scenario_json)
+        previous = None
+        # A job that was interrupted mid-render may have already renamed segment files,
+        # so only a job that never started can safely diff against the previous scenario
+        if job.status == JOB_QUEUED and job.previous_scenario_json:
+            previous = Scenario.model_validate(job.previous_scenario_json)
+
+        job.status = JOB_RUNNING
+        await session.commit()
+
+        # Render tasks report progress concurrently; the session must be used by one at a time
+        session_lock = asyncio.Lock()
+
+        async def on_progress(done: int, total: int):
+            async with session_lock:
+                job.segments_done = done
+                job.segments_total = total
+                await session.commit()
+
+        try:
+            await generate_scenario(scenario, job.lesson_id, previous=previous, on_progress=on_progress,
+                                    encoder_profile=job.encoder_profile)
+            async with session_lock:
+                lesson = await session.get(Lesson, job.lesson_id)
+                lesson.encoder_profile = job.encoder_profile
+                await save_scenario_json(scenario=scenario, lesson_id=job.lesson_id, session=session)
+                job.status = JOB_SUCCEEDED
+                await session.commit()
+        except Exception as e:
+            print(f"Lesson job {job_id} failed: {e}")
+            async with session_lock:
+                await session.rollback()
+                job.status = JOB_FAILED
+                job.error = str(e)[:1000]
+                await session.commit()
+
+
+async def resume_lesson_jobs() -> None:
+    """Restart jobs that were queued or running when the server last stopped."""
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(LessonJob.id).where(LessonJob.status.in_([JOB_QUEUED, JOB_RUNNING]))
+        )
+        job_ids = result.scalars().all()
+
+    for job_id in job_ids:
+        print(f"Resuming lesson job {job_id}")
+        start_lesson_job(job_id)
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List
+
+from PIL import Image
+
+from app.ffmpeg_cmds import get_media_duration, prepare_canvas_image
+from app.previews import (
+    JPEG_QUALITY,
+    POSTER_HEIGHT,
+    POSTER_WIDTH,
+    TILE_HEIGHT,
+    TILE_WIDTH,
+    write_sprite_sheet,
+    write_sprite_vtt,
+)
+from app.scenario.segment_plan import PlannedSegment
+from app.workspace import Workspace
+
+
+def poster_name(segment: PlannedSegment) -> str:
+    return f"{Path(segment.filename).stem}.jpg"
+
+
+def make_posters(segments: List[PlannedSegment], workspace: Workspace) -> Dict[str, Image.Image]:
+    """Letterbox each distinct segment image to poster size; keyed by the image's base64."""
+    posters = {}
+    for segment in segments:
+        if segment.image_b64 and segment.image_b64 not in posters:
+            image_path = workspace.write_base64(segment.image_b64, ".png")
+            posters[segment.image_b64] = prepare_canvas_image(image_path, POSTER_WIDTH, POSTER_HEIGHT)
+    return posters
+
+
+def write_track_previews(
+        previews_dir: str,
+        segment_type: str,
+        segments: List[PlannedSegment],
+        durations: List[float],
+        posters: Dict[str, Image.Image],
+) -> None:
+    """
+    Write a poster per segment with an image, and a sprite sheet of the whole track with
+    one tile per segment, indexed by the track's playback time. Audio-only segments get
+    a black tile and no poster.
+    """
+    black_tile = Image.new("RGB", (TILE_WIDTH, TILE_HEIGHT), (0, 0, 0))
+    tiles = []
+    for segment in segments:
+        poster = posters.get(segment.image_b64) if segment.image_b64 else None
+        if poster is None:
+            tiles.append(black_tile)
+            continue
+        poster.save(os.path.join(previews_dir, poster_name(segment)), "JPEG", quality=JPEG_QUALITY)
+        tiles.append(poster.resize((TILE_WIDTH, TILE_HEIGHT), Image.Resampling.LANCZOS))
+
+    sprite_name = f"{segment_type}_sprite.jpg"
+    write_sprite_sheet(tiles, os.path.join(previews_dir, sprite_name))
+
+    cues = []
+    start = 0.0
+    for duration in durations:
+        cues.append((start, start + duration))
+        start += duration
+    write_sprite_vtt(os.path.join(previews_dir, f"{segment_type}_sprite.vtt"), sprite_name, cues)
+
+
+async def write_lesson_previews(
+        videos_dir: str,
+        previews_dir: str,
+        segments: List[PlannedSegment],
+        workspace: Workspace,
+) -> List[str]:
+    """
+    Write poster JPEGs and per-track thumbnail sprites for a rendered lesson, so lesson
+    lists and scrubbing can show previews without fetching any video.
+
+    Every segment shows a single still image, so posters and tiles come straight from the
+    segment images instead of decoding the rendered videos, and durations come from each
+    segment's movie header. Returns the written file names.
+    """
+    tracks: Dict[str, List[PlannedSegment]] = {}
+    for segment in segments:
+        tracks.setdefault(segment.segment_type, []).append(segment)
+
+    durations = await asyncio.gather(*(
+        get_media_duration(os.path.join(videos_dir, segment.filename)) for segment in segments
+    ))
+    duration_by_file: Dict[str, float] = dict(zip((segment.filename for segment in segments), durations))
+    posters = await asyncio.to_thread(make_posters, segments, workspace)
+
+    # Build next to the live directory and swap it in, like the HLS playlists
+    staging_dir = f"{previews_dir}.new"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+    try:
+        for segment_type, track_segments in tracks.items():
+            await asyncio.to_thread(
+                write_track_previews,
+                staging_dir,
+                segment_type,
+                track_segments,
+                [duration_by_file[segment.filename] for segment in track_segments],
+                posters,
+            )
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    old_dir = f"{previews_dir}.old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(previews_dir):
+        os.rename(previews_dir, old_dir)
+    os.rename(staging_dir, previews_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    return sorted(os.listdir(previews_dir))
+
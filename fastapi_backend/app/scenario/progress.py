@@ -0,0 +1,74 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+# Stages that begin a render; they replace the history of the lesson's previous render
+FIRST_STAGES = {"render_queued", "render_started"}
+# Stages that end a render; subscribers stop listening after one of these
+FINAL_STAGES = {"render_finished", "render_failed"}
+
+
+class RenderProgress:
+    """
+    In-process publish/subscribe hub for lesson render events.
+
+    Events of the latest render of each lesson are kept so that a client which
+    connects mid-render first receives everything that already happened.
+    """
+
+    def __init__(self, max_lessons: int = 100):
+        self.max_lessons = max_lessons
+        self._history: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def publish(self, lesson_id: str, stage: str, **fields: Any) -> None:
+        """Record an event for a lesson and deliver it to every subscriber."""
+        event = {"stage": stage, "lesson_id": lesson_id, "timestamp": time.time(), **fields}
+
+        if stage in FIRST_STAGES:
+            self._history.pop(lesson_id, None)
+        history = self._history.setdefault(lesson_id, [])
+        self._history.move_to_end(lesson_id)
+        history.append(event)
+        while len(self._history) > self.max_lessons:
+            self._history.popitem(last=False)
+
+        for queue in self._subscribers.get(lesson_id, ()):
+            queue.put_nowait(event)
+
+    async def subscribe(
+            self, lesson_id: str, keepalive_interval: Optional[float] = None
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield the lesson's events, starting with the current render's history, until the render ends.
+        Yields None whenever keepalive_interval seconds pass without an event.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(lesson_id, set()).add(queue)
+        try:
+            for event in list(self._history.get(lesson_id, ())):
+                queue.put_nowait(event)
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), keepalive_interval)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                yield event
+                if event["stage"] in FINAL_STAGES:
+                    return
+        finally:
+            self._subscribers[lesson_id].discard(queue)
+            if not self._subscribers[lesson_id]:
+                del self._subscribers[lesson_id]
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Serialize an event in the text/event-stream wire format."""
+    return f"event: {event['stage']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+render_progress = RenderProgress()
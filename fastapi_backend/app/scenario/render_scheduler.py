@@ -0,0 +1,64 @@
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, List, Optional
+
+from app.config import settings
+
+
+class RenderScheduler:
+    """
+    Runs segment render jobs on a bounded pool of workers.
+
+    A job is either a coroutine function, which drives ffmpeg through the async
+    process runner, or a blocking callable, which runs in a worker thread. Either
+    way the encoding happens in ffmpeg child processes, so up to `max_workers`
+    segments are encoded on separate cores.
+    """
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            on_complete: Optional[Callable[[Any], Awaitable[None]]] = None,
+    ):
+        self.max_workers = max_workers or settings.RENDER_MAX_WORKERS
+        self.on_complete = on_complete
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+        self._tasks: List[asyncio.Task] = []
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> None:
+        """Queue a render job; it starts as soon as a worker is free."""
+        self._tasks.append(asyncio.create_task(self._run(func, *args)))
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        async with self._semaphore:
+            if inspect.iscoroutinefunction(func):
+                result = await func(*args)
+            else:
+                thread_job = asyncio.ensure_future(asyncio.to_thread(func, *args))
+                try:
+                    result = await asyncio.shield(thread_job)
+                except asyncio.CancelledError:
+                    # A thread can't be interrupted, so let the job finish before its files go away
+                    await asyncio.gather(thread_job, return_exceptions=True)
+                    raise
+
+        if self.on_complete:
+            await self.on_complete(result)
+        return result
+
+    async def wait(self) -> List[Any]:
+        """
+        Wait for every submitted job and return their results in submission order.
+        If a job fails (or the wait is cancelled), every other job is cancelled: queued jobs
+        never start, and running ffmpeg processes are killed. The error is raised only once
+        all of them have stopped, so the caller can safely clean up the workspace.
+        """
+        try:
+            return await asyncio.gather(*self._tasks)
+        except BaseException:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            raise
+        finally:
+            self._tasks = []
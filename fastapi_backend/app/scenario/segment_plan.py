@@ -0,0 +1,149 @@
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.schema_models.scenario import Scenario
+
+DEFAULT_VOICE = "A neutral, clear voice"
+
+
+class PlannedLine(BaseModel):
+    """A single dialogue line that needs to be synthesized."""
+    role: Optional[str] = None
+    dialogue: str
+    voice_description: str
+
+
+class PlannedSegment(BaseModel):
+    """One output segment: an image (none for audio-only segments) plus the ordered lines spoken over it."""
+    filename: str
+    segment_type: str  # "main" or the branch type
+    segment_number: int
+    image_b64: Optional[str] = None
+    lines: List[PlannedLine]
+
+    def fingerprint(self) -> str:
+        """Hash of everything that affects the rendered video: the image and each line's text and voice."""
+        content = {
+            "image": self.image_b64,
+            "lines": [[line.dialogue, line.voice_description] for line in self.lines],
+        }
+        return hashlib.sha256(json.dumps(content).encode("utf-8")).hexdigest()
+
+
+def resolve_voice(role: Optional[str], character_voices: Dict[str, str]) -> str:
+    """Return the voice description for a character, or the default voice."""
+    voice_description = character_voices.get(role, DEFAULT_VOICE)
+
+    if not voice_description or voice_description.strip() == "":
+        voice_description = DEFAULT_VOICE
+
+    return voice_description
+
+
+def plan_segments(scenario: Scenario) -> List[PlannedSegment]:
+    """
+    Walk a scenario and split it into the video segments generate_scenario renders.
+
+    Segment boundaries follow the scenario structure: a new image starts a new
+    segment, a breakpoint ends the current main segment and every branch option
+    is flushed into its own segment. Main and branch segments are numbered
+    independently, in script order.
+    """
+    character_voices = getattr(scenario, "characters", {}) or {}
+
+    # Trackers
+    current_image_b64: Optional[str] = None
+    current_lines: List[PlannedLine] = []
+
+    segments: List[PlannedSegment] = []
+    main_segment_index = 1  # independent numbering for main script
+    branch_segment_index: Dict[str, int] = {}  # dict: branch_type -> counter
+
+    def get_branch_index(branch_type: str) -> int:
+        """Return and increment the index for this branch type."""
+        if branch_type not in branch_segment_index:
+            branch_segment_index[branch_type] = 1
+
+        idx = branch_segment_index[branch_type]
+        branch_segment_index[branch_type] += 1
+        return idx
+
+    def flush_segment(branch_type: Optional[str]):
+        nonlocal main_segment_index
+
+        if not current_lines:
+            return
+
+        if branch_type:
+            branch_type = branch_type.replace(" ", "-")
+
+        # Filename
+        if branch_type:
+            segment_type = branch_type
+            idx = get_branch_index(branch_type)
+        else:
+            segment_type = "main"
+            idx = main_segment_index
+            main_segment_index += 1
+
+        # Without an image there's nothing to show: the segment is rendered audio-only
+        suffix = ".mp4" if current_image_b64 else ".m4a"
+        segments.append(PlannedSegment(
+            filename=f"segment_{segment_type}_{idx:03d}{suffix}",
+            segment_type=segment_type,
+            segment_number=idx,
+            image_b64=current_image_b64,
+            lines=list(current_lines),
+        ))
+        current_lines.clear()
+
+    def process_dialogue(role, dialogue, image, branch_type: Optional[str]):
+        nonlocal current_image_b64
+
+        # Image begins a new segment
+        if image and image.base64:
+            if current_lines:
+                flush_segment(branch_type)
+            current_image_b64 = image.base64
+
+        if dialogue:
+            current_lines.append(PlannedLine(
+                role=role,
+                dialogue=dialogue,
+                voice_description=resolve_voice(role, character_voices),
+            ))
+
+    # -------------------------------------------------
+    # Process MAIN SCRIPT
+    # -------------------------------------------------
+    for block in scenario.script:
+
+        process_dialogue(block.role, block.dialogue, block.image, None)
+
+        # Breakpoint ends main segment
+        if block.breakpoint:
+            flush_segment(None)
+            continue
+
+        # -------------------------------------------------
+        # Process BRANCHES on this block
+        # -------------------------------------------------
+        if getattr(block, "branch_options", None):
+            for branch in block.branch_options:
+                current_image_b64 = None
+
+                for line in branch.dialogue:
+                    process_dialogue(line.role, line.dialogue, line.image, branch.type)
+
+                # End of branch = flush independently
+                flush_segment(branch.type)
+
+    # -------------------------------------------------
+    # Flush trailing main content
+    # -------------------------------------------------
+    flush_segment(None)
+
+    return segments
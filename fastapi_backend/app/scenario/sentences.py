@@ -0,0 +1,40 @@
+import re
+from typing import List
+
+# A sentence ends at ., ! or ? (or an ellipsis), plus any closing quotes or brackets, before whitespace
+SENTENCE_END = re.compile(r"""(?<=[.!?…])["'”’)\]]*\s+""")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text after each sentence-ending punctuation mark, keeping the punctuation."""
+    sentences = []
+    start = 0
+    for match in SENTENCE_END.finditer(text):
+        sentence = text[start:match.start()] + match.group().rstrip()
+        if sentence.strip():
+            sentences.append(sentence.strip())
+        start = match.end()
+    if text[start:].strip():
+        sentences.append(text[start:].strip())
+    return sentences
+
+
+def split_long_line(text: str, min_chars: int, piece_chars: int) -> List[str]:
+    """
+    Split a line of at least min_chars characters into runs of whole sentences of about
+    piece_chars characters each, so they can be synthesized in parallel. Shorter lines,
+    and lines without a sentence break, come back as a single piece.
+
+    Sentences are only joined while the piece stays under piece_chars, so a single long
+    sentence becomes a piece of its own rather than being cut mid-sentence.
+    """
+    if len(text) < min_chars:
+        return [text]
+
+    pieces: List[str] = []
+    for sentence in split_sentences(text):
+        if pieces and len(pieces[-1]) + 1 + len(sentence) <= piece_chars:
+            pieces[-1] += " " + sentence
+        else:
+            pieces.append(sentence)
+    return pieces if len(pieces) > 1 else [text]
@@ -82,6 +82,7 @@ class LessonRead(LessonBase):
     id: UUID
     created_at: datetime
     user_id: UUID
+    encoder_profile: str
 
     class Config:
         from_attributes = True
@@ -102,3 +103,17 @@ class LessonVideoAddResponse(BaseModel):
     lesson_id: UUID
     video_id: UUID
     index: int
+
+
+class LessonJobRead(BaseModel):
+    id: UUID
+    lesson_id: UUID
+    status: str
+    segments_done: int
+    segments_total: int
+    error: Optional[str] = None
+    encoder_profile: str
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,46 @@
+from typing import Optional
+
+import httpx
+from hume import AsyncHumeClient
+
+from app.config import settings
+
+# One client per process: its connection pool keeps TLS sessions to Hume open between utterances
+_client: Optional[AsyncHumeClient] = None
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def create_tts_client() -> AsyncHumeClient:
+    """Build a Hume client on a keep-alive connection pool sized by the TTS_HTTP_* settings."""
+    global _client, _http_client
+    _http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.TTS_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.TTS_HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=settings.TTS_HTTP_KEEPALIVE_SECONDS,
+        ),
+        timeout=httpx.Timeout(settings.TTS_REQUEST_TIMEOUT_SECONDS, connect=settings.TTS_CONNECT_TIMEOUT_SECONDS),
+    )
+    _client = AsyncHumeClient(
+        api_key=settings.HUME_API_KEY,
+        base_url=settings.HUME_BASE_URL,
+        timeout=settings.TTS_REQUEST_TIMEOUT_SECONDS,
+        httpx_client=_http_client,
+    )
+    return _client
+
+
+def get_tts_client() -> AsyncHumeClient:
+    """
+    The shared Hume client, opened by the app lifespan. Created on first use outside the
+    app (scripts, tests), where close_tts_client should be awaited when done.
+    """
+    return _client or create_tts_client()
+
+
+async def close_tts_client() -> None:
+    global _client, _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _client = None
+    _http_client = None
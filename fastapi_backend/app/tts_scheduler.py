@@ -0,0 +1,164 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+import httpx
+from hume.core.api_error import ApiError
+
+from app.config import settings
+
+T = TypeVar("T")
+
+# Priority lanes; a lower number is served first
+INTERACTIVE = 0  # an author waiting on /tts/synthesize
+BULK = 1  # lesson renders
+
+# Passed to every Hume call so the SDK doesn't retry on its own, outside the rate budget
+NO_SDK_RETRIES = {"max_retries": 0}
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, and bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available. A rate of 0 is unlimited."""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Rate limiting, provider errors and dropped connections are worth another try; bad requests aren't."""
+    if isinstance(error, ApiError):
+        return error.status_code == 429 or (error.status_code or 0) >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def retry_after(error: BaseException) -> float:
+    """The delay a 429/503 response asked for in its Retry-After header, in seconds, or 0."""
+    headers = getattr(error, "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return max(float(value), 0.0) if value else 0.0
+    except ValueError:
+        return 0.0  # an HTTP date; fall back to our own backoff
+
+
+class TTSScheduler:
+    """
+    Process-wide gate for TTS provider requests, shared by every render and preview.
+
+    A request starts once a token-bucket allows it (requests_per_second, with bursts of
+    `burst`) and fewer than max_concurrency requests are in flight. Waiting requests
+    start in priority order, then in arrival order. Failed requests that are worth
+    retrying (see is_retryable) go back into the queue after a jittered exponential
+    backoff, or the delay the provider asked for, up to max_retries times.
+    """
+
+    def __init__(
+            self,
+            requests_per_second: float,
+            burst: int,
+            max_concurrency: int,
+            max_retries: int,
+            backoff_base: float,
+            backoff_max: float,
+    ):
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.active = 0
+        self.retries = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _dispatch(self) -> None:
+        """Start as many waiting requests as the concurrency budget and the bucket allow."""
+        while self._waiters and self.active < self.max_concurrency:
+            future = self._waiters[0][2]
+            if future.cancelled():
+                heapq.heappop(self._waiters)
+                continue
+            wait = self.bucket.take()
+            if wait > 0:
+                if self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later(wait, self._on_timer)
+                return
+            heapq.heappop(self._waiters)
+            self.active += 1
+            future.set_result(None)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def _release(self) -> None:
+        self.active -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: int = BULK) -> AsyncIterator[None]:
+        """Hold one request slot for the duration of the block, e.g. a whole audio stream."""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()  # the slot was granted just as we were cancelled
+            raise
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        # Full jitter spreads out the retries of requests that failed together
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after(error))
+
+    async def run(self, call: Callable[[], Awaitable[T]], priority: int = BULK) -> T:
+        """Await call() in a slot, retrying it while it fails with a retryable error."""
+        for attempt in itertools.count():
+            try:
+                async with self.slot(priority):
+                    return await call()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.backoff(attempt, e)
+                self.retries += 1
+                print(f"TTS request failed ({e.__class__.__name__} "
+                      f"{getattr(e, 'status_code', '')}), retry {attempt + 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+tts_scheduler = TTSScheduler(
+    requests_per_second=settings.TTS_REQUESTS_PER_SECOND,
+    burst=settings.TTS_BURST,
+    max_concurrency=settings.TTS_MAX_IN_FLIGHT,
+    max_retries=settings.TTS_MAX_RETRIES,
+    backoff_base=settings.TTS_BACKOFF_BASE_SECONDS,
+    backoff_max=settings.TTS_BACKOFF_MAX_SECONDS,
+)
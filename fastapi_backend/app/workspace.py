@@ -0,0 +1,180 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Union
+
+from app.base64_stream import detect_media_suffix, iter_base64_chunks
+from app.config import settings
+
+OWNER_FILE = ".owner"
+TRASH_PREFIX = ".trash_"
+
+
+class WorkspaceQuotaExceeded(Exception):
+    pass
+
+
+def workspace_root() -> Path:
+    """Directory that holds every job workspace; point RENDER_WORKSPACE_DIR at a tmpfs to keep scratch files in RAM."""
+    root = Path(settings.RENDER_WORKSPACE_DIR or os.path.join(tempfile.gettempdir(), "edupulse-render"))
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+class Workspace:
+    """
+    Scratch directory for the intermediate files of a single job.
+
+    Every pipeline stage writes its temporary images, audio clips and ffmpeg
+    inputs here instead of loose temp files, and the whole directory is removed
+    when the job finishes or fails. Use it as a context manager.
+
+    The quota is checked against a running count of the bytes written, so it never
+    walks the directory: write_bytes and write_base64 count their own files, and files
+    written by other processes at a new_path are counted with add_file. rescan() brings
+    the count back in line with the disk when needed.
+    """
+
+    def __init__(self, prefix: str = "job", quota_bytes: Optional[int] = None, root: Optional[Path] = None):
+        self.root = root or workspace_root()
+        self.quota_bytes = quota_bytes if quota_bytes is not None else settings.RENDER_WORKSPACE_QUOTA_BYTES
+        self.path = Path(tempfile.mkdtemp(prefix=f"{prefix}_", dir=self.root))
+        self.used_bytes = 0
+        # Files are written from worker threads as well as the event loop
+        self._lock = threading.Lock()
+        # Lets the startup janitor tell live workspaces from ones orphaned by a crash
+        (self.path / OWNER_FILE).write_text(f"{socket.gethostname()} {os.getpid()}")
+
+    def __enter__(self) -> "Workspace":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.cleanup()
+
+    def new_path(self, suffix: str = "") -> str:
+        """Return a fresh, unused file path inside the workspace."""
+        return str(self.path / f"{uuid.uuid4().hex}{suffix}")
+
+    def write_bytes(self, data: bytes, suffix: str = "") -> str:
+        """Write data to a new file in the workspace and return its path."""
+        self.reserve(len(data))
+        path = self.new_path(suffix)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def write_base64(self, data_b64: str, suffix: str = "") -> str:
+        """
+        Decode base64 media into a new file in the workspace and return its path.
+        The suffix is taken from the decoded content when it's a known image or audio
+        type, otherwise the given suffix is used.
+        """
+        estimated = len(data_b64) * 3 // 4
+        self.reserve(estimated)
+        chunks = iter_base64_chunks(data_b64)
+        head = next(chunks, b"")
+        path = self.new_path(detect_media_suffix(head) or suffix)
+        written = len(head)
+        with open(path, "wb") as f:
+            f.write(head)
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        # The estimate also counted any data: URL prefix and padding
+        self.add_bytes(written - estimated)
+        return path
+
+    def add_bytes(self, size: int) -> None:
+        with self._lock:
+            self.used_bytes += size
+
+    def add_file(self, path: Union[str, Path]) -> None:
+        """Count a file another process (e.g. ffmpeg) wrote at a path from new_path."""
+        self.add_bytes(os.path.getsize(path))
+
+    def reserve(self, incoming_bytes: int) -> None:
+        """Count incoming_bytes about to be written, raising WorkspaceQuotaExceeded if they don't fit."""
+        with self._lock:
+            self.check_quota(incoming_bytes)
+            self.used_bytes += incoming_bytes
+
+    def size_bytes(self) -> int:
+        """Walk the workspace and add up the size of its files."""
+        return sum(entry.stat().st_size for entry in self.path.rglob("*") if entry.is_file())
+
+    def rescan(self) -> int:
+        """Reset the running count to the size of the files actually on disk, and return it."""
+        size = self.size_bytes()
+        with self._lock:
+            self.used_bytes = size
+        return size
+
+    def check_quota(self, incoming_bytes: int = 0) -> None:
+        """Raise WorkspaceQuotaExceeded if the workspace (plus incoming_bytes) is over its quota."""
+        used = self.used_bytes + incoming_bytes
+        if self.quota_bytes and used > self.quota_bytes:
+            raise WorkspaceQuotaExceeded(
+                f"Workspace {self.path.name} needs {used} bytes, quota is {self.quota_bytes}"
+            )
+
+    def cleanup(self) -> None:
+        remove_workspace(self.path)
+
+
+def remove_workspace(path: Union[str, Path]) -> None:
+    """Rename the workspace out of the way in one step, then delete its contents."""
+    path = Path(path)
+    trash = path.with_name(f"{TRASH_PREFIX}{path.name}")
+    try:
+        os.rename(path, trash)
+    except FileNotFoundError:
+        return
+    shutil.rmtree(trash, ignore_errors=True)
+
+
+def _owner_is_alive(path: Path) -> bool:
+    try:
+        hostname, pid = (path / OWNER_FILE).read_text().split()
+    except (FileNotFoundError, ValueError):
+        # The owner file is written right after the directory is created
+        return time.time() - path.stat().st_mtime < 60
+
+    if hostname != socket.gethostname():
+        # Workspace root shared with another host; we can't check its processes
+        return True
+
+    if int(pid) == os.getpid():
+        # A previous run that happened to get our pid (common in containers)
+        return False
+
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # alive, but owned by another user
+    return True
+
+
+def cleanup_orphaned_workspaces(root: Optional[Path] = None) -> int:
+    """
+    Delete workspaces left behind by processes that died mid-job. Returns how many were removed.
+    Run it at startup, before this process creates workspaces of its own.
+    """
+    root = root or workspace_root()
+    removed = 0
+    for entry in root.iterdir():
+        if not entry.is_dir():
+            continue
+        if entry.name.startswith(TRASH_PREFIX):
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+        elif not _owner_is_alive(entry):
+            remove_workspace(entry)
+            removed += 1
+    return removed
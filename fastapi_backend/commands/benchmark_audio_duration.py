@@ -0,0 +1,68 @@
+"""
+Compare per-call latency of the in-process duration reader with ffprobe.
+
+    python -m commands.benchmark_audio_duration [AUDIO_FILE ...]
+
+Without arguments, 30 second AAC and MP3 test tones are generated with ffmpeg.
+"""
+import asyncio
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+from app.audio_duration import read_audio_duration
+from app.ffmpeg_cmds import probe_duration
+
+PARSER_CALLS = 1000
+FFPROBE_CALLS = 20
+
+
+def make_test_clips(directory: str) -> List[str]:
+    paths = []
+    for suffix, codec in ((".aac", "aac"), (".mp3", "libmp3lame")):
+        path = str(Path(directory) / f"tone{suffix}")
+        subprocess.run(
+            ["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=30",
+             "-c:a", codec, "-b:a", "128k", path],
+            check=True,
+        )
+        paths.append(path)
+    return paths
+
+
+def time_per_call(fn: Callable[[str], object], path: str, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn(path)
+    return (time.perf_counter() - start) / calls
+
+
+async def time_per_async_call(fn: Callable[[str], Awaitable[object]], path: str, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        await fn(path)
+    return (time.perf_counter() - start) / calls
+
+
+async def benchmark(paths: List[str]) -> None:
+    for path in paths:
+        parsed = read_audio_duration(path)
+        probed = await probe_duration(path)
+        parser_seconds = time_per_call(read_audio_duration, path, PARSER_CALLS)
+        ffprobe_seconds = await time_per_async_call(probe_duration, path, FFPROBE_CALLS)
+
+        print(Path(path).name)
+        print(f"  duration  parser {parsed}s, ffprobe {probed}s")
+        print(f"  per call  parser {parser_seconds * 1e6:.1f}us, ffprobe {ffprobe_seconds * 1e3:.2f}ms "
+              f"({ffprobe_seconds / parser_seconds:.0f}x)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        asyncio.run(benchmark(sys.argv[1:]))
+    else:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            asyncio.run(benchmark(make_test_clips(tmpdir)))
@@ -0,0 +1,112 @@
+"""
+Compare the output size and encode time of audio-only segments with still-video segments.
+
+    python -m commands.benchmark_audio_only_segments [AUDIO_FILE ...] [--image IMAGE]
+        [--profile draft|standard|final] [--runs N]
+
+Each audio file is rendered as one segment, both ways: over a still image, as segments
+with an image are, and audio-only, as segments without one now are. Without audio files,
+MP3 test tones of 10, 30 and 60 seconds are generated with ffmpeg; without an image, a
+test picture is drawn. Encode times are the median of --runs renders.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from PIL import Image, ImageDraw
+
+from app.ffmpeg_cmds import get_encoder_profile, make_segment_videos
+
+TEST_TONE_SECONDS = (10, 30, 60)
+
+
+def make_test_tones(directory: str) -> List[str]:
+    paths = []
+    for seconds in TEST_TONE_SECONDS:
+        path = str(Path(directory) / f"tone_{seconds}s.mp3")
+        subprocess.run(
+            ["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+             "-c:a", "libmp3lame", "-b:a", "128k", path],
+            check=True,
+        )
+        paths.append(path)
+    return paths
+
+
+def make_test_image(directory: str, width: int, height: int) -> str:
+    """A slide-like picture: a gradient background with a few shapes, so it isn't trivially compressible."""
+    image = Image.new("RGB", (width, height))
+    draw = ImageDraw.Draw(image)
+    for y in range(height):
+        draw.line([(0, y), (width, y)], fill=(40, 60 + 120 * y // height, 160))
+    for i in range(6):
+        left = width * i // 6 + 20
+        draw.rectangle([left, height // 3, left + width // 8, height // 3 + height // 4], fill=(230, 200 - 30 * i, 80))
+    path = str(Path(directory) / "slide.png")
+    image.save(path, "PNG")
+    return path
+
+
+def print_row(name: str, video_bytes: int, video_seconds: float, audio_bytes: int, audio_seconds: float) -> None:
+    print(f"{name:<24}"
+          f"{video_bytes / 1024:>10.0f}KB {video_seconds * 1000:>7.0f}ms"
+          f"{audio_bytes / 1024:>10.0f}KB {audio_seconds * 1000:>7.0f}ms"
+          f"{(1 - audio_bytes / video_bytes) * 100:>13.0f}%"
+          f"{(1 - audio_seconds / video_seconds) * 100:>11.0f}%")
+
+
+async def timed_render(image_path: Optional[str], audio_path: str, output_path: str, profile, runs: int) -> float:
+    """Median seconds to render the segment, still clip included, as a render without a cached one does."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await make_segment_videos(image_path, [([audio_path], output_path)], profile)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+async def benchmark(
+        audio_paths: List[str],
+        image_path: Optional[str],
+        profile_name: str,
+        runs: int,
+        directory: str,
+) -> None:
+    profile = get_encoder_profile(profile_name)
+    image_path = image_path or make_test_image(directory, profile.width, profile.height)
+
+    print(f"profile {profile.name}, image {Path(image_path).name}")
+    print(f"{'segment':<24}{'still video':>22}{'audio-only':>22}{'bytes saved':>14}{'time saved':>12}")
+    totals = [0, 0.0, 0, 0.0]
+    for audio_path in audio_paths:
+        stem = Path(audio_path).stem
+        video_path = str(Path(directory) / f"{stem}.mp4")
+        audio_only_path = str(Path(directory) / f"{stem}.m4a")
+        video_seconds = await timed_render(image_path, audio_path, video_path, profile, runs)
+        audio_seconds = await timed_render(None, audio_path, audio_only_path, profile, runs)
+
+        video_bytes = os.path.getsize(video_path)
+        audio_bytes = os.path.getsize(audio_only_path)
+        row = (video_bytes, video_seconds, audio_bytes, audio_seconds)
+        totals = [total + value for total, value in zip(totals, row)]
+        print_row(Path(audio_path).name, *row)
+    print_row("total", *totals)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("audio", nargs="*")
+    parser.add_argument("--image")
+    parser.add_argument("--profile", default="standard")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        audio_paths = args.audio or make_test_tones(tmpdir)
+        asyncio.run(benchmark(audio_paths, args.image, args.profile, args.runs, tmpdir))
@@ -0,0 +1,69 @@
+"""
+Compare round trips and wall time of synthesizing a scenario's lines one request per
+line against batched multi-utterance requests, with a local fake of the Hume TTS endpoint.
+
+    python -m commands.benchmark_tts_batching [--lines 60] [--request-latency-ms 300] [--char-latency-ms 2]
+
+The fake answers each request after request_latency plus char_latency per character,
+a rough model of a fixed per-request cost (round trip, queueing, model start) plus
+synthesis time that grows with the text. Requests also go through the TTS scheduler,
+so TTS_REQUESTS_PER_SECOND applies (0 turns the rate limit off).
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+from app.config import settings
+from app.disk_cache import DiskLRUCache
+from app.routes import tts
+from app.scenario.generate_scenario import synthesize_lines
+from app.scenario.segment_plan import PlannedLine
+from app.tts_client import close_tts_client
+from commands.fake_hume import start_fake_hume
+
+VOICES = ["Warm female teacher", "Curious young student", "Calm male narrator"]
+
+
+def make_lines(count: int) -> list[PlannedLine]:
+    rng = random.Random(0)
+    words = "the cell divides and each half keeps a full copy of its genetic material".split()
+    return [
+        PlannedLine(dialogue=" ".join(rng.choices(words, k=rng.randint(6, 20))), voice_description=VOICES[i % 3])
+        for i in range(count)
+    ]
+
+
+async def benchmark(line_count: int, request_latency: float, char_latency: float) -> None:
+    server = start_fake_hume(request_latency=request_latency, char_latency=char_latency)
+    settings.HUME_API_KEY, settings.HUME_BASE_URL = "fake", server.base_url
+    lines = make_lines(line_count)
+    chars = sum(len(line.dialogue) for line in lines)
+    print(f"{line_count} lines, {chars} characters, {settings.TTS_MAX_CONCURRENCY} requests at a time, "
+          f"at most {settings.TTS_REQUESTS_PER_SECOND:g} requests/s")
+
+    for max_utterances in (1, settings.TTS_BATCH_MAX_UTTERANCES):
+        settings.TTS_BATCH_MAX_UTTERANCES = max_utterances
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # Start cold, every line goes to the fake server
+            tts.tts_audio_cache = DiskLRUCache(cache_dir, 1024 * 1024 * 1024, suffix=".audio")
+            server.requests_served = 0
+            started = time.perf_counter()
+            await synthesize_lines(lines)
+            elapsed = time.perf_counter() - started
+        print(f"  {max_utterances} utterance(s) per request  {server.requests_served:3d} round trips  "
+              f"{elapsed:.2f}s")
+
+    await close_tts_client()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=60)
+    parser.add_argument("--request-latency-ms", type=float, default=300)
+    parser.add_argument("--char-latency-ms", type=float, default=2)
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.lines, args.request_latency_ms / 1000, args.char_latency_ms / 1000))
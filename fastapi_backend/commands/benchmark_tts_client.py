@@ -0,0 +1,61 @@
+"""
+Compare per-utterance latency of a new Hume client per call (the old behaviour) with
+the pooled process-wide client, against a local fake of the Hume TTS endpoint.
+
+    python -m commands.benchmark_tts_client [--calls 50] [--connect-delay-ms 30]
+
+--connect-delay-ms delays the first request on every new connection, standing in for
+the TCP and TLS round trips to the real API that a pooled connection skips.
+"""
+import argparse
+import asyncio
+import time
+
+from hume import HumeClient
+from hume.tts import PostedUtterance
+
+from app.config import settings
+from app.tts_client import close_tts_client, get_tts_client
+from commands.fake_hume import start_fake_hume
+
+
+def utterances(index: int):
+    return [PostedUtterance(text=f"Line number {index}", description="Warm narrator")]
+
+
+def new_client_per_call(base_url: str, index: int) -> None:
+    client = HumeClient(api_key="fake", base_url=base_url)
+    client.tts.synthesize_json(utterances=utterances(index), num_generations=1, version="1")
+
+
+async def benchmark(calls: int, connect_delay: float) -> None:
+    server = start_fake_hume(connect_delay)
+    base_url = server.base_url
+
+    started = time.perf_counter()
+    for index in range(calls):
+        await asyncio.to_thread(new_client_per_call, base_url, index)
+    per_call = (time.perf_counter() - started) / calls
+
+    settings.HUME_API_KEY, settings.HUME_BASE_URL = "fake", base_url
+    client = get_tts_client()
+    started = time.perf_counter()
+    for index in range(calls):
+        await client.tts.synthesize_json(utterances=utterances(index), num_generations=1, version="1")
+    pooled = (time.perf_counter() - started) / calls
+    await close_tts_client()
+    server.shutdown()
+
+    print(f"{calls} sequential utterances, {connect_delay * 1000:.0f}ms per new connection")
+    print(f"  client per call  {per_call * 1000:.2f}ms per utterance")
+    print(f"  pooled client    {pooled * 1000:.2f}ms per utterance")
+    print(f"  saved            {(per_call - pooled) * 1000:.2f}ms per utterance")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--connect-delay-ms", type=float, default=30)
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.calls, args.connect_delay_ms / 1000))
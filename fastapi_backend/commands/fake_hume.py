@@ -0,0 +1,73 @@
+"""
+A local stand-in for the Hume TTS JSON endpoint, for the TTS benchmarks.
+
+Answers POST /v0/tts with a generation holding one snippet per utterance, after
+sleeping request_latency plus char_latency per character of text, and counts requests.
+"""
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_mp3(text: str) -> str:
+    # One MPEG-1 Layer III frame header and padding per character, enough to tell utterances apart
+    return base64.b64encode((b"\xff\xfb\x90\x64" + b"\0" * 413) * len(text)).decode("ascii")
+
+
+class FakeHumeServer(ThreadingHTTPServer):
+    requests_served = 0
+    connect_delay = 0.0
+    request_latency = 0.0
+    char_latency = 0.0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class FakeHumeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+    server: FakeHumeServer
+
+    def setup(self):
+        super().setup()
+        # Stands in for the TCP and TLS round trips of a new connection
+        time.sleep(self.server.connect_delay)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        texts = [utterance["text"] for utterance in request["utterances"]]
+        self.server.requests_served += 1
+        time.sleep(self.server.request_latency + self.server.char_latency * sum(map(len, texts)))
+
+        snippets = [[{
+            "audio": fake_mp3(text), "generation_id": "fake", "id": f"snippet-{index}", "text": text,
+            "timestamps": [], "utterance_index": index,
+        }] for index, text in enumerate(texts)]
+        audio = b"".join(base64.b64decode(fake_mp3(text)) for text in texts)
+        body = json.dumps({"generations": [{
+            "audio": base64.b64encode(audio).decode("ascii"), "duration": 1.0,
+            "encoding": {"format": "mp3", "sample_rate": 48000}, "file_size": len(audio),
+            "generation_id": "fake", "snippets": snippets,
+        }]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fake_hume(connect_delay: float = 0.0, request_latency: float = 0.0,
+                    char_latency: float = 0.0) -> FakeHumeServer:
+    server = FakeHumeServer(("127.0.0.1", 0), FakeHumeHandler)
+    server.connect_delay = connect_delay
+    server.request_latency = request_latency
+    server.char_latency = char_latency
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
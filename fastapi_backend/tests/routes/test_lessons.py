@@ -0,0 +1,85 @@
+import pytest
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.models import Lesson, LessonJob
+from app.routes.lesson import queue_lesson_job
+from app.schema_models.scenario import Scenario
+
+
+def make_scenario(title="Test Lesson"):
+    return Scenario.model_validate({
+        "title": title,
+        "characters": {"Teacher": "Warm female voice"},
+        "script": [{"role": "Teacher", "dialogue": "Hello class.", "image": {"base64": "img1"}}],
+    })
+
+
+async def make_lesson(db_session, user, title="Test Lesson"):
+    lesson = Lesson(title=title, user_id=user.id)
+    db_session.add(lesson)
+    await db_session.commit()
+    await db_session.refresh(lesson)
+    return lesson
+
+
+class TestLessonJobs:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_database_allows_one_active_job_per_lesson(self, db_session, authenticated_user):
+        lesson = await make_lesson(db_session, authenticated_user["user"])
+        scenario_json = make_scenario().dict()
+        db_session.add(LessonJob(lesson_id=lesson.id, status="succeeded", scenario_json=scenario_json))
+        db_session.add(LessonJob(lesson_id=lesson.id, status="running", scenario_json=scenario_json))
+        await db_session.commit()
+
+        db_session.add(LessonJob(lesson_id=lesson.id, status="queued", scenario_json=scenario_json))
+        with pytest.raises(IntegrityError):
+            await db_session.commit()
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_racing_render_requests_get_409(self, db_session, authenticated_user, mocker):
+        mocker.patch("app.scenario.jobs.start_lesson_job")
+        lesson = await make_lesson(db_session, authenticated_user["user"])
+
+        # Both requests passed the active job check before either inserted its job
+        await queue_lesson_job(lesson.id, make_scenario(), db_session)
+        lesson.title = "Renamed"
+        with pytest.raises(HTTPException) as error:
+            await queue_lesson_job(lesson.id, make_scenario("Renamed"), db_session)
+
+        assert error.value.status_code == status.HTTP_409_CONFLICT
+        jobs = (await db_session.execute(select(LessonJob).where(LessonJob.lesson_id == lesson.id))).scalars().all()
+        assert len(jobs) == 1
+        await db_session.refresh(lesson)
+        assert lesson.title == "Test Lesson"
+
+
+class TestLessonSegments:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_segments_stream_while_first_render_runs(
+            self, test_client, db_session, authenticated_user, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        lesson = await make_lesson(db_session, authenticated_user["user"])
+        url = f"/lessons/{lesson.id}/segment"
+
+        # No scenario saved and no render: nothing to serve
+        response = await test_client.get(url, params={"segment_number": 1})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        db_session.add(LessonJob(lesson_id=lesson.id, status="running", scenario_json=make_scenario().dict()))
+        await db_session.commit()
+        videos_dir = tmp_path / "lessons" / str(lesson.id) / "videos"
+        videos_dir.mkdir(parents=True)
+        (videos_dir / "segment_main_001.mp4").write_bytes(b"encoded")
+
+        # The first segment is encoded, the second one isn't yet
+        response = await test_client.get(url, params={"segment_number": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == b"encoded"
+        response = await test_client.get(url, params={"segment_number": 2})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = await test_client.get(f"/lessons/{lesson.id}/scenario")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["scenario"]["title"] == "Test Lesson"
@@ -0,0 +1,113 @@
+import base64
+from types import SimpleNamespace
+
+from hume.tts import ReturnGeneration
+
+from app.config import settings
+from app.disk_cache import DiskLRUCache
+from app.routes import tts
+from app.routes.tts import (
+    TTSRequest,
+    plan_tts_batches,
+    split_utterance_audio,
+    spool_to_cache,
+    stream_with_hume,
+    synthesize_batch_with_hume,
+)
+
+
+def make_request(text, fmt="mp3"):
+    return TTSRequest(text=text, voice_description="voice", format=fmt)
+
+
+def test_plan_tts_batches_respects_size_limits_and_order():
+    requests = [make_request("x" * 10) for _ in range(7)] + [make_request("y" * 50), make_request("z", "wav")]
+
+    batches = plan_tts_batches(requests, max_utterances=3, max_chars=40)
+
+    assert batches == [[0, 1, 2], [3, 4, 5], [6], [7], [8]]
+
+
+def test_split_utterance_audio_joins_snippets_per_utterance():
+    def b64(data):
+        return base64.b64encode(data).decode("ascii")
+
+    def snippet(audio, utterance_index):
+        return {"audio": b64(audio), "generation_id": "g", "id": audio.decode(), "text": "t",
+                "timestamps": [], "utterance_index": utterance_index}
+
+    generation = ReturnGeneration.model_validate({
+        "audio": b64(b"a1a2b1"), "duration": 1.0, "encoding": {"format": "mp3", "sample_rate": 48000},
+        "file_size": 6, "generation_id": "g",
+        "snippets": [[snippet(b"a1", 0), snippet(b"a2", 0)], [snippet(b"b1", 1)]],
+    })
+
+    assert split_utterance_audio(generation, 2) == [b"a1a2", b"b1"]
+
+
+async def fake_chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_spool_to_cache_streams_chunks_and_caches_the_whole_clip(tmp_path, monkeypatch):
+    monkeypatch.setattr(tts, "tts_audio_cache", DiskLRUCache(tmp_path, 1024 * 1024))
+
+    streamed = [chunk async for chunk in spool_to_cache(b"ab", fake_chunks(b"cd", b"ef"), "key")]
+
+    assert streamed == [b"ab", b"cd", b"ef"]
+    assert tts.tts_audio_cache.get_bytes("key") == b"abcdef"
+
+
+async def test_spool_to_cache_skips_abandoned_streams(tmp_path, monkeypatch):
+    monkeypatch.setattr(tts, "tts_audio_cache", DiskLRUCache(tmp_path, 1024 * 1024))
+
+    stream = spool_to_cache(b"ab", fake_chunks(b"cd"), "key")
+    assert await anext(stream) == b"ab"
+    await stream.aclose()  # the client went away
+
+    assert tts.tts_audio_cache.get_bytes("key") is None
+
+
+class FakeHumeTts:
+    """Records the keyword arguments of each SDK call."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def synthesize_file_streaming(self, **kwargs):
+        self.calls.append(kwargs)
+        yield b"audio"
+
+    async def synthesize_json(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(generations=[SimpleNamespace(audio=base64.b64encode(b"audio").decode("ascii"))])
+
+
+def use_fake_hume(monkeypatch):
+    fake = FakeHumeTts()
+    monkeypatch.setattr(tts, "get_tts_client", lambda: SimpleNamespace(tts=fake))
+    return fake
+
+
+async def test_stream_with_hume_designs_the_voice_from_its_description(monkeypatch):
+    fake = use_fake_hume(monkeypatch)
+
+    assert [chunk async for chunk in stream_with_hume(make_request("hello"))] == [b"audio"]
+
+    [call] = fake.calls
+    assert call["instant_mode"] is False
+    assert call["utterances"][0].description == "voice"
+    assert call["utterances"][0].voice is None
+
+
+async def test_synthesize_batch_with_hume_designs_the_voice_from_its_description(tmp_path, monkeypatch):
+    fake = use_fake_hume(monkeypatch)
+    monkeypatch.setattr(tts, "tts_audio_cache", DiskLRUCache(tmp_path, 1024 * 1024))
+    monkeypatch.setattr(settings, "HUME_API_KEY", "key")
+
+    [response] = await synthesize_batch_with_hume([make_request("hello")])
+
+    assert base64.b64decode(response.audio_url) == b"audio"
+    [call] = fake.calls
+    assert call["instant_mode"] is False
@@ -0,0 +1,103 @@
+from app.scenario.generate_scenario import (
+    group_segments_by_image,
+    read_render_manifest,
+    reuse_unchanged_segments,
+    segment_cache_key,
+    write_render_manifest,
+)
+from app.ffmpeg_cmds import get_encoder_profile
+from app.scenario.segment_plan import PlannedLine, PlannedSegment
+
+
+def make_segment(filename, *texts, image=None):
+    lines = [PlannedLine(dialogue=text, voice_description="voice") for text in texts]
+    number = int(filename[-7:-4])
+    return PlannedSegment(filename=filename, segment_type="main", segment_number=number, image_b64=image, lines=lines)
+
+
+def fingerprints(segments):
+    return {segment.filename: segment.fingerprint() for segment in segments}
+
+
+def test_reuse_unchanged_segments_renumbers_and_cleans_up(tmp_path):
+    previous = [
+        make_segment("segment_main_001.mp4", "intro"),
+        make_segment("segment_main_002.mp4", "middle"),
+        make_segment("segment_main_003.mp4", "outro"),
+    ]
+    for segment in previous:
+        (tmp_path / segment.filename).write_text(segment.lines[0].dialogue)
+
+    # "middle" was removed and a new segment was inserted at the front
+    segments = [
+        make_segment("segment_main_001.mp4", "new"),
+        make_segment("segment_main_002.mp4", "intro"),
+        make_segment("segment_main_003.mp4", "outro", image="img"),
+    ]
+
+    to_render = reuse_unchanged_segments(str(tmp_path), segments, fingerprints(previous))
+
+    assert [s.filename for s in to_render] == ["segment_main_001.mp4", "segment_main_003.mp4"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["segment_main_002.mp4"]
+    assert (tmp_path / "segment_main_002.mp4").read_text() == "intro"
+
+
+def test_reuse_unchanged_segments_moves_renditions_and_needs_all_of_them(tmp_path):
+    previous = [make_segment("segment_main_001.mp4", "intro"), make_segment("segment_main_002.mp4", "outro")]
+    (tmp_path / "360p").mkdir()
+    (tmp_path / "540p").mkdir()
+    for segment in previous:
+        (tmp_path / segment.filename).write_text(segment.lines[0].dialogue)
+        (tmp_path / "540p" / segment.filename).write_text("no longer rendered")
+    (tmp_path / "360p" / "segment_main_002.mp4").write_text("outro 360p")  # intro's is missing
+
+    segments = [make_segment("segment_main_001.mp4", "outro"), make_segment("segment_main_002.mp4", "intro")]
+
+    to_render = reuse_unchanged_segments(str(tmp_path), segments, fingerprints(previous), ["360p"])
+
+    assert [s.filename for s in to_render] == ["segment_main_002.mp4"]
+    assert (tmp_path / "360p" / "segment_main_001.mp4").read_text() == "outro 360p"
+    assert sorted(p.name for p in (tmp_path / "360p").iterdir()) == ["segment_main_001.mp4"]
+    assert list((tmp_path / "540p").iterdir()) == []
+
+
+def test_render_manifest_only_trusts_files_finished_under_the_current_plan(tmp_path):
+    profile = get_encoder_profile("draft")
+    intro, outro = make_segment("segment_main_001.mp4", "intro"), make_segment("segment_main_002.mp4", "outro")
+    for segment in (intro, outro):
+        (tmp_path / segment.filename).write_text(segment.lines[0].dialogue)
+    write_render_manifest(str(tmp_path), profile, segments=[intro, outro])
+
+    # A render of [new, intro] moves intro to 002 and fails before 001 is written
+    new_plan = [make_segment("segment_main_001.mp4", "new"), make_segment("segment_main_002.mp4", "intro")]
+    reuse_unchanged_segments(str(tmp_path), new_plan, read_render_manifest(str(tmp_path))["segments"])
+    write_render_manifest(str(tmp_path), profile, segments=[new_plan[1]])
+    (tmp_path / "segment_main_001.mp4").write_text("partial")
+
+    # Retrying the old scenario reuses intro from where it now is and renders outro again
+    to_render = reuse_unchanged_segments(str(tmp_path), [intro, outro], read_render_manifest(str(tmp_path))["segments"])
+
+    assert [s.filename for s in to_render] == ["segment_main_002.mp4"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["render.json", "segment_main_001.mp4"]
+    assert (tmp_path / "segment_main_001.mp4").read_text() == "intro"
+
+
+def test_group_segments_by_image_splits_large_groups():
+    segments = [
+        make_segment("segment_main_001.mp4", "a", image="bg"),
+        make_segment("segment_main_002.mp4", "b"),
+        make_segment("segment_main_003.mp4", "c", image="bg"),
+        make_segment("segment_main_004.mp4", "d", image="bg"),
+    ]
+
+    groups = group_segments_by_image(segments, max_group_size=2)
+
+    assert [[s.filename[-7:-4] for s in group] for group in groups] == [["001", "003"], ["004"], ["002"]]
+
+
+def test_segment_cache_key_includes_the_container():
+    profile = get_encoder_profile("draft")
+    video_key = segment_cache_key("videos/segment_main_001.mp4", "audio-only", ["a"], profile)
+
+    assert video_key == segment_cache_key("videos/segment_main_002.mp4", "audio-only", ["a"], profile)
+    assert video_key != segment_cache_key("videos/segment_main_001.m4a", "audio-only", ["a"], profile)
@@ -0,0 +1,18 @@
+from app.scenario.hls import PLAYLIST_NAME, write_track_playlist
+
+
+def test_write_track_playlist_joins_segments_with_discontinuities(tmp_path):
+    entries = [
+        ['#EXT-X-MAP:URI="a_init.mp4"', "#EXTINF:6.300000,", "a_000.m4s"],
+        ['#EXT-X-MAP:URI="b_init.mp4"', "#EXTINF:1.700000,", "b_000.m4s"],
+    ]
+
+    path = write_track_playlist(str(tmp_path), entries)
+
+    lines = (tmp_path / PLAYLIST_NAME).read_text().splitlines()
+    assert path.endswith(PLAYLIST_NAME)
+    assert lines[0] == "#EXTM3U"
+    assert "#EXT-X-TARGETDURATION:7" in lines
+    assert lines[-1] == "#EXT-X-ENDLIST"
+    body = lines[lines.index('#EXT-X-MAP:URI="a_init.mp4"'):-1]
+    assert body == entries[0] + ["#EXT-X-DISCONTINUITY"] + entries[1]
@@ -0,0 +1,26 @@
+from PIL import Image
+
+from app.previews import POSTER_HEIGHT, POSTER_WIDTH
+from app.scenario.previews import write_track_previews
+from app.scenario.segment_plan import PlannedLine, PlannedSegment
+
+
+def make_segment(number, image=None):
+    line = PlannedLine(dialogue=f"line {number}", voice_description="voice")
+    suffix = ".mp4" if image else ".m4a"
+    return PlannedSegment(filename=f"segment_main_{number:03d}{suffix}", segment_type="main",
+                          segment_number=number, image_b64=image, lines=[line])
+
+
+def test_write_track_previews_posters_and_sprite_follow_playback_time(tmp_path):
+    segments = [make_segment(1, image="slide"), make_segment(2), make_segment(3, image="slide")]
+    posters = {"slide": Image.new("RGB", (POSTER_WIDTH, POSTER_HEIGHT), (255, 255, 255))}
+
+    write_track_previews(str(tmp_path), "main", segments, [4.0, 2.5, 3.0], posters)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "main_sprite.jpg", "main_sprite.vtt", "segment_main_001.jpg", "segment_main_003.jpg",
+    ]
+    vtt = (tmp_path / "main_sprite.vtt").read_text()
+    assert "00:00:04.000 --> 00:00:06.500\nmain_sprite.jpg#xywh=160,0,160,90" in vtt
+    assert "00:00:06.500 --> 00:00:09.500" in vtt
@@ -0,0 +1,41 @@
+from app.scenario.progress import RenderProgress, format_sse
+
+
+async def test_subscribe_replays_history_and_stops_after_render():
+    progress = RenderProgress()
+    progress.publish("lesson", "render_started", total=1)
+    progress.publish("lesson", "segment_encoded", segment="segment_main_001.mp4", elapsed_ms=12.5)
+
+    events = progress.subscribe("lesson")
+    assert (await anext(events))["stage"] == "render_started"
+    assert (await anext(events))["segment"] == "segment_main_001.mp4"
+
+    progress.publish("lesson", "render_finished", total=1)
+    assert [event["stage"] async for event in events] == ["render_finished"]
+
+
+async def test_queued_render_replaces_the_finished_render_history():
+    progress = RenderProgress()
+    progress.publish("lesson", "render_started", total=1)
+    progress.publish("lesson", "render_finished", total=1)
+    progress.publish("lesson", "render_queued", job_id="job")
+
+    events = progress.subscribe("lesson")
+    assert (await anext(events))["stage"] == "render_queued"
+
+    progress.publish("lesson", "render_started", total=2)
+    progress.publish("lesson", "render_failed", error="boom")
+    assert [event["stage"] async for event in events] == ["render_started", "render_failed"]
+
+
+async def test_subscribe_yields_keepalive_when_idle():
+    progress = RenderProgress()
+    events = progress.subscribe("lesson", keepalive_interval=0.01)
+
+    assert await anext(events) is None
+    await events.aclose()
+
+
+def test_format_sse():
+    event = {"stage": "render_started", "total": 2}
+    assert format_sse(event) == 'event: render_started\ndata: {"stage": "render_started", "total": 2}\n\n'
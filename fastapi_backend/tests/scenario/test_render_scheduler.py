@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.scenario.render_scheduler import RenderScheduler
+
+
+async def test_render_scheduler_bounds_workers_and_keeps_order():
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def job(i):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return i
+
+    scheduler = RenderScheduler(max_workers=2)
+    for i in range(6):
+        scheduler.submit(job, i)
+
+    assert await scheduler.wait() == list(range(6))
+    assert peak == 2
+
+
+async def test_render_scheduler_raises_job_errors():
+    def fail():
+        raise RuntimeError("ffmpeg failed")
+
+    scheduler = RenderScheduler(max_workers=1)
+    scheduler.submit(fail)
+
+    with pytest.raises(RuntimeError, match="ffmpeg failed"):
+        await scheduler.wait()
+
+
+async def test_render_scheduler_awaits_coroutine_jobs():
+    async def job(i):
+        await asyncio.sleep(0.01 * (3 - i))
+        return i
+
+    scheduler = RenderScheduler(max_workers=3)
+    for i in range(3):
+        scheduler.submit(job, i)
+
+    assert await scheduler.wait() == [0, 1, 2]
+
+
+async def test_render_scheduler_stops_running_jobs_before_raising():
+    events = []
+
+    async def slow_job():
+        events.append("started")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.01)  # e.g. killing and reaping ffmpeg
+            events.append("stopped")
+            raise
+
+    async def failing_job():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("ffmpeg failed")
+
+    def thread_job():
+        time.sleep(0.05)
+        events.append("thread finished")
+
+    scheduler = RenderScheduler(max_workers=3)
+    scheduler.submit(slow_job)
+    scheduler.submit(thread_job)
+    scheduler.submit(failing_job)
+
+    with pytest.raises(RuntimeError, match="ffmpeg failed"):
+        await scheduler.wait()
+    assert sorted(events) == ["started", "stopped", "thread finished"]
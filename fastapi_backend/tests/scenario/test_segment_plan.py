@@ -0,0 +1,94 @@
+import asyncio
+
+from app.config import settings
+from app.scenario.generate_scenario import synthesize_lines
+from app.scenario.segment_plan import DEFAULT_VOICE, PlannedLine, plan_segments
+from app.schema_models.scenario import Scenario
+
+
+def make_scenario():
+    return Scenario.model_validate({
+        "title": "Test Lesson",
+        "characters": {"Teacher": "Warm female voice", "Student": " "},
+        "script": [
+            {"role": "Teacher", "dialogue": "Hello class.", "image": {"base64": "img1"}},
+            {"role": "Student", "dialogue": "Hi!"},
+            {"role": "Teacher", "dialogue": "A question.", "breakpoint": {
+                "question": "Ready?",
+                "options": [{"text": "Yes", "isCorrect": True}],
+            }},
+            {"branch_options": [
+                {"type": "option A", "dialogue": [{"role": "Teacher", "dialogue": "Correct."}]},
+                {"type": "option B", "dialogue": [
+                    {"role": "Teacher", "dialogue": "Not quite.", "image": {"base64": "img2"}},
+                    {"role": "Teacher", "dialogue": "Try again.", "image": {"base64": "img3"}},
+                ]},
+            ]},
+            {"role": "Narrator", "dialogue": "The end.", "image": {"base64": "img4"}},
+        ],
+    })
+
+
+def test_plan_segments_boundaries_and_numbering():
+    segments = plan_segments(make_scenario())
+
+    assert [s.filename for s in segments] == [
+        "segment_main_001.mp4",
+        "segment_option-A_001.m4a",  # no image: audio-only
+        "segment_option-B_001.mp4",
+        "segment_option-B_002.mp4",
+        "segment_main_002.mp4",
+    ]
+    assert [len(s.lines) for s in segments] == [3, 1, 1, 1, 1]
+    assert [s.image_b64 for s in segments] == ["img1", None, "img2", "img3", "img4"]
+
+
+def test_plan_segments_resolves_voices():
+    segments = plan_segments(make_scenario())
+    voices = [line.voice_description for line in segments[0].lines]
+
+    assert voices == ["Warm female voice", DEFAULT_VOICE, "Warm female voice"]
+    assert segments[-1].lines[0].voice_description == DEFAULT_VOICE
+
+
+async def test_synthesize_lines_preserves_order(mocker):
+    async def fake_audios(lines):
+        # Finish the first batch last to make sure ordering doesn't depend on timing
+        await asyncio.sleep(0.01 * len(lines))
+        return [f"audio:{line.dialogue}" for line in lines]
+
+    get_b64_audios = mocker.patch("app.scenario.generate_scenario.get_b64_audios", side_effect=fake_audios)
+    texts = ["a", "bb", "ccc", "dddd", "eeeee", "ffffff", "g"]
+    lines = [PlannedLine(dialogue=text, voice_description=DEFAULT_VOICE) for text in texts]
+
+    assert await synthesize_lines(lines, max_concurrency=2) == [f"audio:{text}" for text in texts]
+    assert [len(call.args[0]) for call in get_b64_audios.call_args_list] == [4, 3]
+
+
+async def test_synthesize_lines_splits_long_lines_into_parallel_pieces(mocker):
+    mocker.patch.multiple(settings, TTS_SPLIT_LONG_LINES=True, TTS_SPLIT_MIN_CHARS=20, TTS_SPLIT_PIECE_CHARS=10)
+
+    async def fake_audios(lines):
+        # Finish the first piece last to make sure the pieces are joined in order anyway
+        await asyncio.sleep(0.01 * (3 - len(lines[0].dialogue) % 3))
+        return [f"audio:{line.dialogue}" for line in lines]
+
+    get_b64_audios = mocker.patch("app.scenario.generate_scenario.get_b64_audios", side_effect=fake_audios)
+    mocker.patch("app.scenario.generate_scenario.join_b64_audios", side_effect="|".join)
+    done = []
+    texts = ["Hi.", "Cells divide. Each half grows. Then again.", "Bye.", "Ok."]
+    lines = [PlannedLine(dialogue=text, voice_description=f"voice {i}") for i, text in enumerate(texts)]
+
+    audios = await synthesize_lines(lines, max_concurrency=2, on_line_done=lambda index, _: done.append(index))
+
+    assert audios == [
+        "audio:Hi.", "audio:Cells divide.|audio:Each half grows.|audio:Then again.", "audio:Bye.", "audio:Ok.",
+    ]
+    batches = [[(line.dialogue, line.voice_description) for line in call.args[0]]
+               for call in get_b64_audios.call_args_list]
+    assert batches == [
+        [("Hi.", "voice 0")],
+        [("Cells divide.", "voice 1")], [("Each half grows.", "voice 1")], [("Then again.", "voice 1")],
+        [("Bye.", "voice 2"), ("Ok.", "voice 3")],
+    ]
+    assert sorted(done) == [0, 1, 2, 3]
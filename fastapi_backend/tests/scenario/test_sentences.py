@@ -0,0 +1,20 @@
+from app.scenario.sentences import split_long_line, split_sentences
+
+
+def test_split_sentences_keeps_punctuation_and_quotes():
+    text = 'Cells divide. "Why?" she asked.  Because… they grow!And then'
+
+    assert split_sentences(text) == ["Cells divide.", '"Why?"', "she asked.", "Because…", "they grow!And then"]
+
+
+def test_split_long_line_regroups_whole_sentences():
+    sentences = ["One two three.", "Four five six.", "Seven eight nine ten eleven.", "Twelve."]
+    text = " ".join(sentences)
+
+    assert split_long_line(text, min_chars=len(text) + 1, piece_chars=30) == [text]
+    assert split_long_line(text, min_chars=10, piece_chars=30) == [
+        "One two three. Four five six.", "Seven eight nine ten eleven.", "Twelve.",
+    ]
+    assert split_long_line("No sentence break at all " * 5, min_chars=10, piece_chars=30) == [
+        "No sentence break at all " * 5,
+    ]
@@ -0,0 +1,101 @@
+import struct
+
+import pytest
+
+from app.audio_duration import read_audio_duration, read_mp4_duration
+
+
+def adts_frame(payload_size=10, sample_rate_index=4):
+    frame_length = 7 + payload_size
+    header = bytes([
+        0xFF, 0xF1,
+        (1 << 6) | (sample_rate_index << 2),  # AAC LC
+        (1 << 6) | (frame_length >> 11),  # mono
+        (frame_length >> 3) & 0xFF,
+        ((frame_length & 0x07) << 5) | 0x1F,
+        0xFC,  # one raw data block
+    ])
+    return header + bytes(payload_size)
+
+
+def mp3_frame(padding=0):
+    # MPEG-1 Layer III, 128 kbps, 44.1 kHz, joint stereo: 417 bytes + padding
+    header = bytes([0xFF, 0xFB, 0x90 | (padding << 1), 0x64])
+    return header + bytes(417 + padding - 4)
+
+
+def test_reads_adts_duration(tmp_path):
+    path = tmp_path / "speech.aac"
+    path.write_bytes(adts_frame() * 43 + adts_frame(sample_rate_index=3) * 2)
+
+    assert read_audio_duration(path) == pytest.approx(45 * 1024 / 44100)
+
+
+def test_walks_mp3_frames_and_skips_tags(tmp_path):
+    id3 = b"ID3\x04\x00\x00\x00\x00\x00\x05" + bytes(5)
+    path = tmp_path / "speech.mp3"
+    path.write_bytes(id3 + (mp3_frame() + mp3_frame(padding=1)) * 5 + b"TAG" + bytes(125))
+
+    assert read_audio_duration(path) == pytest.approx(10 * 1152 / 44100)
+
+
+def test_uses_xing_frame_count(tmp_path):
+    frame = bytearray(mp3_frame())
+    # Xing tag after 32 bytes of stereo side info: frames flag set, 1000 frames
+    frame[36:48] = b"Xing" + (1).to_bytes(4, "big") + (1000).to_bytes(4, "big")
+    path = tmp_path / "vbr.mp3"
+    path.write_bytes(bytes(frame) + mp3_frame())
+
+    assert read_audio_duration(path) == pytest.approx(1000 * 1152 / 44100)
+
+
+def test_uses_vbri_frame_count(tmp_path):
+    frame = bytearray(mp3_frame())
+    frame[36:54] = b"VBRI" + bytes(10) + (250).to_bytes(4, "big")
+    path = tmp_path / "vbr.mp3"
+    path.write_bytes(bytes(frame))
+
+    assert read_audio_duration(path) == pytest.approx(250 * 1152 / 44100)
+
+
+def test_unknown_formats_return_none(tmp_path):
+    path = tmp_path / "speech.wav"
+    path.write_bytes(b"RIFF" + bytes(40))
+    empty = tmp_path / "empty.mp3"
+    empty.write_bytes(b"")
+
+    assert read_audio_duration(path) is None
+    assert read_audio_duration(empty) is None
+
+
+def mp4_box(box_type, payload, large=False):
+    if large:
+        return struct.pack(">I4sQ", 1, box_type, 16 + len(payload)) + payload
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def test_reads_mp4_duration_after_the_media_data(tmp_path):
+    mvhd = mp4_box(b"mvhd", bytes(4) + struct.pack(">IIII", 0, 0, 1000, 12345) + bytes(80))
+    path = tmp_path / "segment.mp4"
+    path.write_bytes(
+        mp4_box(b"ftyp", b"isom" + bytes(4))
+        + mp4_box(b"mdat", bytes(5000), large=True)
+        + mp4_box(b"moov", mp4_box(b"free", bytes(16)) + mvhd)
+    )
+
+    assert read_mp4_duration(path) == pytest.approx(12.345)
+
+
+def test_reads_64_bit_mp4_duration(tmp_path):
+    mvhd = mp4_box(b"mvhd", b"\x01" + bytes(3) + struct.pack(">QQIQ", 0, 0, 44100, 44100 * 90) + bytes(80))
+    path = tmp_path / "segment.m4a"
+    path.write_bytes(mp4_box(b"ftyp", b"M4A " + bytes(4)) + mp4_box(b"moov", mvhd))
+
+    assert read_mp4_duration(path) == pytest.approx(90)
+
+
+def test_mp4_without_movie_header_has_no_duration(tmp_path):
+    path = tmp_path / "speech.mp3"
+    path.write_bytes(mp3_frame() * 10)
+
+    assert read_mp4_duration(path) is None
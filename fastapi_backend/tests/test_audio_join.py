@@ -0,0 +1,47 @@
+import pytest
+
+from app.audio_duration import mp3_duration
+from app.audio_join import join_mp3, mp3_frames
+
+
+def mp3_frame(padding=0, protected=False):
+    # MPEG-1 Layer III, 128 kbps, 44.1 kHz, joint stereo: 417 bytes + padding
+    header = bytes([0xFF, 0xFA if protected else 0xFB, 0x90 | (padding << 1), 0x64])
+    return header + b"\x55" * (417 + padding - 4)
+
+
+def xing_frame(frame_count):
+    frame = bytearray(mp3_frame())
+    frame[36:48] = b"Xing" + (1).to_bytes(4, "big") + frame_count.to_bytes(4, "big")
+    return bytes(frame)
+
+
+def test_mp3_frames_drops_tags_and_header_frame():
+    id3 = b"ID3\x04\x00\x00\x00\x00\x00\x05" + bytes(5)
+    audio = mp3_frame() + mp3_frame(padding=1)
+
+    frames, header = mp3_frames(id3 + xing_frame(2) + audio + b"TAG" + bytes(125))
+
+    assert frames == audio
+    assert header == audio[:4]
+    assert mp3_frames(b"RIFF" + bytes(40)) is None
+
+
+def test_join_mp3_adds_silent_frames_between_clips():
+    clips = [xing_frame(3) + mp3_frame() * 3, mp3_frame(protected=True) * 2, mp3_frame()]
+
+    joined = join_mp3(clips, gap_seconds=0.1)
+
+    # 0.1s is 3.8 frames of 1152 samples at 44.1 kHz, so 4 silent frames per gap
+    assert mp3_duration(joined) == pytest.approx((3 + 2 + 1 + 2 * 4) * 1152 / 44100)
+    assert joined.startswith(mp3_frame() * 3)
+    silence = joined[3 * 417:7 * 417]
+    assert silence == (bytes([0xFF, 0xFB, 0x90, 0x64]) + bytes(413)) * 4
+    assert joined.endswith(silence + mp3_frame())
+
+
+def test_join_mp3_concatenates_what_it_cannot_parse():
+    clips = [mp3_frame(), b"not audio"]
+
+    assert join_mp3(clips, gap_seconds=0.5) == mp3_frame() + b"not audio"
+    assert join_mp3([b"only"], gap_seconds=0.5) == b"only"
@@ -0,0 +1,31 @@
+import base64
+
+import pytest
+
+from app.base64_stream import detect_media_suffix, iter_base64_chunks, write_base64_file
+
+
+@pytest.mark.parametrize("chunk_chars", [4, 8, 1024])
+def test_iter_base64_chunks_handles_prefix_whitespace_and_padding(chunk_chars):
+    data = bytes(range(256)) * 3 + b"xy"
+    encoded = base64.b64encode(data).decode().rstrip("=")
+    # Break it into lines like a MIME body, with a data URI in front
+    wrapped = "data:audio/mpeg;base64," + "\n".join(encoded[i:i + 7] for i in range(0, len(encoded), 7))
+
+    assert b"".join(iter_base64_chunks(wrapped, chunk_chars)) == data
+
+
+def test_detect_media_suffix():
+    assert detect_media_suffix(b"\xff\xd8\xff\xe0") == ".jpg"
+    assert detect_media_suffix(b"\x89PNG\r\n\x1a\n") == ".png"
+    assert detect_media_suffix(b"RIFF\0\0\0\0WEBPVP8") == ".webp"
+    assert detect_media_suffix(b"\xff\xfb\x94\x64") == ".mp3"
+    assert detect_media_suffix(b"\xff\xf1\x50\x40") == ".aac"
+    assert detect_media_suffix(b"hello") is None
+
+
+def test_write_base64_file(tmp_path):
+    path = tmp_path / "clip.bin"
+
+    assert write_base64_file(base64.b64encode(b"audio bytes").decode(), path) == 11
+    assert path.read_bytes() == b"audio bytes"
@@ -0,0 +1,50 @@
+import os
+
+from app.disk_cache import DiskLRUCache
+
+
+def test_disk_cache_hits_and_misses(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=1024, suffix=".bin")
+    key = DiskLRUCache.make_key("hello", "warm voice", "mp3")
+
+    assert cache.get_bytes(key) is None
+    cache.put_bytes(key, b"audio")
+
+    assert cache.get_bytes(key) == b"audio"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_make_key_separates_parts():
+    assert DiskLRUCache.make_key("ab", "c") != DiskLRUCache.make_key("a", "bc")
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=25, suffix=".bin")
+    keys = [DiskLRUCache.make_key(str(i)) for i in range(3)]
+
+    for i, key in enumerate(keys[:2]):
+        path = cache.put_bytes(key, b"x" * 10)
+        os.utime(path, (i, i))
+
+    # Reading the oldest entry makes the second one the eviction candidate
+    assert cache.get(keys[0]) is not None
+    cache.put_bytes(keys[2], b"x" * 10)
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+    assert cache.stats()["size_bytes"] == 20
+
+
+def test_disk_cache_counts_a_replaced_entry_once(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=1024, suffix=".bin")
+    key, other = DiskLRUCache.make_key("a"), DiskLRUCache.make_key("b")
+    cache.put_bytes(other, b"x" * 10)
+    assert cache.stats()["size_bytes"] == 10
+
+    for _ in range(3):
+        cache.put_bytes(key, b"y" * 10)
+    cache.put_bytes(key, b"y" * 12)
+
+    assert cache.stats()["size_bytes"] == 22
@@ -0,0 +1,125 @@
+import pytest
+from PIL import Image
+
+from app.ffmpeg_cmds import (
+    ENCODER_PROFILES,
+    RENDITION_LADDER,
+    SegmentOutput,
+    adts_stream_config,
+    get_encoder_profile,
+    prepare_canvas_image,
+    rendition_profile,
+    segment_videos_cmd,
+)
+
+
+def test_encoder_profiles_have_distinct_cache_keys():
+    keys = {profile.settings_key() for profile in ENCODER_PROFILES.values()}
+    assert len(keys) == len(ENCODER_PROFILES)
+
+
+def test_draft_profile_is_smaller_than_standard():
+    draft, standard = get_encoder_profile("draft"), get_encoder_profile("standard")
+    assert draft.width * draft.height < standard.width * standard.height
+    assert draft.crf > standard.crf
+    assert "-ac" in draft.audio_args()
+
+
+def test_get_encoder_profile_defaults_and_rejects_unknown_names():
+    assert get_encoder_profile().name == "standard"
+    with pytest.raises(ValueError):
+        get_encoder_profile("lossless")
+
+
+def test_adts_stream_config_detects_aac_only(tmp_path):
+    # AAC LC, 44.1kHz, mono
+    aac = tmp_path / "speech.aac"
+    aac.write_bytes(bytes([0xFF, 0xF1, 0x50, 0x40, 0x00, 0x1F, 0xFC]))
+    mp3 = tmp_path / "speech.mp3"
+    mp3.write_bytes(bytes([0xFF, 0xFB, 0x90, 0x64, 0x00]))
+
+    assert adts_stream_config(str(aac)) == (1, 4, 1)
+    assert adts_stream_config(str(mp3)) is None
+
+
+def test_prepare_canvas_image_letterboxes_in_memory(tmp_path):
+    source = tmp_path / "slide.jpg"
+    Image.new("RGB", (4000, 1000), (255, 255, 255)).save(source, "JPEG")
+    before = source.read_bytes()
+
+    canvas = prepare_canvas_image(str(source), 640, 360)
+
+    assert canvas.size == (640, 360)
+    assert canvas.getpixel((320, 10)) == (0, 0, 0)  # bar above the wide image
+    assert canvas.getpixel((320, 180))[0] > 200
+    assert source.read_bytes() == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["slide.jpg"]
+
+
+def test_segment_videos_cmd_writes_every_output_from_one_still_clip(tmp_path):
+    aac = tmp_path / "line.aac"
+    aac.write_bytes(bytes([0xFF, 0xF1, 0x50, 0x40, 0x00, 0x1F, 0xFC]))
+    mp3s = [str(tmp_path / f"line_{i}.mp3") for i in range(2)]
+    for path in mp3s:
+        with open(path, "wb") as f:
+            f.write(bytes([0xFF, 0xFB, 0x90, 0x64, 0x00]))
+
+    profile = get_encoder_profile("standard")
+    cmd = segment_videos_cmd(
+        [
+            SegmentOutput(audio_paths=[str(aac)], output_path="a.mp4", profile=profile, still_clip_path="still.mp4"),
+            SegmentOutput(audio_paths=mp3s, output_path="b.mp4", profile=profile, still_clip_path="still.mp4"),
+        ],
+        [1.5, 4.0],
+    )
+
+    assert cmd.count("-stream_loop") == 1
+    assert cmd[cmd.index("-filter_complex") + 1] == "[2:a][3:a]concat=n=2:v=0:a=1[a1]"
+    assert cmd[cmd.index("a.mp4") - 7:cmd.index("a.mp4")] == ["1:a", "-c:a", "copy", "-c:v", "copy", "-t", "1.5"]
+    assert cmd[-1] == "b.mp4"
+
+
+def test_segment_videos_cmd_without_still_clip_is_audio_only(tmp_path):
+    mp3 = tmp_path / "line.mp3"
+    mp3.write_bytes(bytes([0xFF, 0xFB, 0x90, 0x64, 0x00]))
+
+    cmd = segment_videos_cmd([
+        SegmentOutput(audio_paths=[str(mp3)], output_path="a.m4a", profile=get_encoder_profile("draft")),
+    ])
+
+    assert "-stream_loop" not in cmd and "0:v" not in cmd
+    assert cmd[cmd.index("-filter_complex") + 1] == "[0:a]concat=n=1:v=0:a=1[a0]"
+    assert cmd[-1] == "a.m4a"
+
+
+def test_rendition_profile_scales_down_and_skips_renditions_as_large_as_the_profile():
+    standard = get_encoder_profile("standard")
+    draft = get_encoder_profile("draft")
+    small = rendition_profile(standard, RENDITION_LADDER[0])
+
+    assert (small.width, small.height) == (640, 360)
+    assert small.audio_bitrate == RENDITION_LADDER[0].audio_bitrate
+    assert not small.copy_aac_audio
+    assert small.settings_key() != standard.settings_key()
+    assert rendition_profile(draft, RENDITION_LADDER[1]) is None
+
+
+def test_segment_videos_cmd_reads_shared_audio_once_for_every_rendition(tmp_path):
+    mp3 = tmp_path / "line.mp3"
+    mp3.write_bytes(bytes([0xFF, 0xFB, 0x90, 0x64, 0x00]))
+    standard = get_encoder_profile("standard")
+    small = rendition_profile(standard, RENDITION_LADDER[0])
+
+    cmd = segment_videos_cmd(
+        [
+            SegmentOutput(audio_paths=[str(mp3)], output_path="a.mp4", profile=standard, still_clip_path="still.mp4"),
+            SegmentOutput(audio_paths=[str(mp3)], output_path="360p/a.mp4", profile=small,
+                          still_clip_path="still_360p.mp4"),
+        ],
+        [2.0, 2.0],
+    )
+
+    assert cmd.count("-stream_loop") == 2
+    assert cmd.count(str(mp3)) == 1
+    assert cmd[cmd.index("-filter_complex") + 1] == "[2:a]concat=n=1:v=0:a=1,asplit=2[a0_0][a0_1]"
+    assert cmd[cmd.index("360p/a.mp4") - 12:cmd.index("360p/a.mp4") - 8] == ["-map", "1:v", "-map", "[a0_1]"]
@@ -0,0 +1,31 @@
+from PIL import Image
+
+from app.previews import TILE_HEIGHT, TILE_WIDTH, format_vtt_timestamp, write_sprite_sheet, write_sprite_vtt
+
+
+def test_format_vtt_timestamp():
+    assert format_vtt_timestamp(0) == "00:00:00.000"
+    assert format_vtt_timestamp(3725.5) == "01:02:05.500"
+
+
+def test_write_sprite_vtt_points_each_cue_at_its_tile(tmp_path):
+    path = tmp_path / "sprite.vtt"
+
+    write_sprite_vtt(path, "sprite.jpg", [(0.0, 2.0)] * 10 + [(20.0, 21.5)])
+
+    lines = path.read_text().splitlines()
+    assert lines[0] == "WEBVTT"
+    assert lines[2:4] == ["00:00:00.000 --> 00:00:02.000", f"sprite.jpg#xywh=0,0,{TILE_WIDTH},{TILE_HEIGHT}"]
+    assert lines[-2:] == ["00:00:20.000 --> 00:00:21.500", f"sprite.jpg#xywh=0,{TILE_HEIGHT},{TILE_WIDTH},{TILE_HEIGHT}"]
+
+
+def test_write_sprite_sheet_wraps_rows(tmp_path):
+    tiles = [Image.new("RGB", (TILE_WIDTH, TILE_HEIGHT), (255, 255, 255)) for _ in range(12)]
+    path = tmp_path / "sprite.jpg"
+
+    write_sprite_sheet(tiles, path)
+
+    with Image.open(path) as sheet:
+        assert sheet.size == (10 * TILE_WIDTH, 2 * TILE_HEIGHT)
+        assert sheet.getpixel((TILE_WIDTH // 2, TILE_HEIGHT + 10))[0] > 200
+        assert sheet.getpixel((5 * TILE_WIDTH, TILE_HEIGHT + 10))[0] < 50  # past the last tile
@@ -0,0 +1,43 @@
+import asyncio
+import sys
+
+import pytest
+
+from app.process_runner import ProcessError, ProcessTimeout, run_process
+
+
+async def test_run_process_captures_stdout():
+    result = await run_process([sys.executable, "-c", "print('12.5')"], capture_stdout=True)
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == b"12.5"
+
+
+async def test_run_process_raises_with_stderr_tail():
+    script = "import sys; sys.stderr.write('x' * 5000 + 'boom'); sys.exit(3)"
+
+    with pytest.raises(ProcessError, match="boom") as exc_info:
+        await run_process([sys.executable, "-c", script], stderr_limit=100)
+
+    assert len(exc_info.value.stderr) == 100
+
+
+async def test_run_process_kills_on_timeout():
+    with pytest.raises(ProcessTimeout):
+        await run_process([sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.2)
+
+
+async def test_run_process_kills_on_cancellation():
+    task = asyncio.create_task(run_process([sys.executable, "-c", "import time; time.sleep(30)"]))
+    await asyncio.sleep(0.2)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(task, timeout=5)
+
+
+async def test_run_process_feeds_stdin():
+    script = "import sys; print(len(sys.stdin.buffer.read()))"
+    result = await run_process([sys.executable, "-c", script], capture_stdout=True, input=b"\0" * 1_000_000)
+
+    assert result.stdout.strip() == b"1000000"
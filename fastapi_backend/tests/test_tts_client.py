@@ -0,0 +1,10 @@
+from app.tts_client import close_tts_client, get_tts_client
+
+
+async def test_get_tts_client_is_shared_until_closed():
+    client = get_tts_client()
+    assert get_tts_client() is client
+
+    await close_tts_client()
+    assert get_tts_client() is not client
+    await close_tts_client()
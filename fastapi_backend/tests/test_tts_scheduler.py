@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import pytest
+from hume.core.api_error import ApiError
+
+from app.tts_scheduler import BULK, INTERACTIVE, TTSScheduler
+
+
+def make_scheduler(**overrides):
+    options = dict(requests_per_second=0, burst=1, max_concurrency=1, max_retries=3,
+                   backoff_base=0.001, backoff_max=0.01)
+    return TTSScheduler(**{**options, **overrides})
+
+
+async def test_interactive_requests_go_ahead_of_queued_bulk_requests():
+    scheduler = make_scheduler()
+    order = []
+
+    async def request(name, priority):
+        async with scheduler.slot(priority):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async with scheduler.slot(BULK):  # everything else has to queue
+        tasks = [asyncio.create_task(request(name, BULK)) for name in ("bulk-1", "bulk-2")]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(request("preview", INTERACTIVE)))
+        await asyncio.sleep(0)
+
+    await asyncio.gather(*tasks)
+    assert order == ["preview", "bulk-1", "bulk-2"]
+
+
+async def test_run_retries_rate_limits_but_not_bad_requests():
+    scheduler = make_scheduler()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ApiError(status_code=429, headers={})
+        return "audio"
+
+    assert await scheduler.run(flaky) == "audio"
+    assert scheduler.retries == 2
+
+    async def bad_request():
+        raise ApiError(status_code=400)
+
+    with pytest.raises(ApiError):
+        await scheduler.run(bad_request)
+    assert scheduler.retries == 2
+
+
+async def test_token_bucket_spaces_out_requests():
+    scheduler = make_scheduler(requests_per_second=20, max_concurrency=10)
+
+    async def request():
+        return time.monotonic()
+
+    started = time.monotonic()
+    times = await asyncio.gather(*(scheduler.run(request) for _ in range(4)))
+
+    # One token up front, then one every 50ms
+    assert max(times) - started >= 0.14
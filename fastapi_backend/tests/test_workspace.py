@@ -0,0 +1,73 @@
+import base64
+import os
+import socket
+
+import pytest
+
+from app.workspace import OWNER_FILE, Workspace, WorkspaceQuotaExceeded, cleanup_orphaned_workspaces
+
+
+def test_workspace_is_removed_on_exit(tmp_path):
+    with Workspace(root=tmp_path) as workspace:
+        path = workspace.write_bytes(b"audio", ".mp3")
+        assert os.path.exists(path)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_workspace_is_removed_when_job_fails(tmp_path):
+    with pytest.raises(RuntimeError):
+        with Workspace(root=tmp_path) as workspace:
+            workspace.write_bytes(b"audio", ".mp3")
+            raise RuntimeError("render failed")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_base64_detects_media_type(tmp_path):
+    jpeg = base64.b64encode(b"\xff\xd8\xff\xe0" + bytes(100)).decode()
+    with Workspace(root=tmp_path) as workspace:
+        image_path = workspace.write_base64(f"data:image/png;base64,{jpeg}", ".png")
+        unknown_path = workspace.write_base64(base64.b64encode(b"hello").decode(), ".mp3")
+
+        assert image_path.endswith(".jpg")
+        assert unknown_path.endswith(".mp3")
+        with open(unknown_path, "rb") as f:
+            assert f.read() == b"hello"
+
+
+def test_workspace_quota(tmp_path):
+    with Workspace(root=tmp_path, quota_bytes=100) as workspace:
+        workspace.write_bytes(b"x" * 60)
+        with pytest.raises(WorkspaceQuotaExceeded):
+            workspace.write_bytes(b"x" * 60)
+
+
+def test_workspace_counts_bytes_without_walking(tmp_path, monkeypatch):
+    with Workspace(root=tmp_path, quota_bytes=100) as workspace:
+        monkeypatch.setattr(workspace, "size_bytes", lambda: pytest.fail("quota check walked the workspace"))
+        workspace.write_base64(f"data:audio/mpeg;base64,{base64.b64encode(b'x' * 30).decode()}", ".mp3")
+        rendered_path = workspace.new_path(".mp4")
+        with open(rendered_path, "wb") as f:  # written by ffmpeg
+            f.write(b"x" * 50)
+        workspace.add_file(rendered_path)
+
+        assert workspace.used_bytes == 80
+        with pytest.raises(WorkspaceQuotaExceeded):
+            workspace.write_bytes(b"x" * 30)
+        assert workspace.used_bytes == 80
+
+        monkeypatch.undo()
+        os.remove(rendered_path)
+        assert workspace.rescan() == 30 + len(workspace.path.joinpath(OWNER_FILE).read_bytes())
+
+
+def test_cleanup_orphaned_workspaces(tmp_path):
+    live = Workspace(root=tmp_path)
+    (live.path / OWNER_FILE).write_text(f"{socket.gethostname()} 1")  # init is always running
+    orphan = Workspace(root=tmp_path)
+    (orphan.path / OWNER_FILE).write_text(f"{socket.gethostname()} 999999999")  # above any pid_max
+    (tmp_path / ".trash_job_abc").mkdir()
+
+    assert cleanup_orphaned_workspaces(tmp_path) == 2
+    assert [p.name for p in tmp_path.iterdir()] == [live.path.name]
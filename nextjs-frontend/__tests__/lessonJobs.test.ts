@@ -0,0 +1,65 @@
+import { waitForLessonJob } from "@/lib/lesson-jobs";
+import { getLessonJob } from "@/app/openapi-client";
+
+jest.mock("../app/openapi-client", () => ({
+  getLessonJob: jest.fn(),
+}));
+
+function job(status: string, segments_done = 0, error: string | null = null) {
+  return {
+    id: "job-1",
+    lesson_id: "lesson-1",
+    status,
+    segments_done,
+    segments_total: 3,
+    error,
+    encoder_profile: "standard",
+    created_at: "2026-01-01T00:00:00",
+    updated_at: "2026-01-01T00:00:00",
+  };
+}
+
+describe("waitForLessonJob", () => {
+  it("should poll until the job succeeds and report progress", async () => {
+    (getLessonJob as jest.Mock)
+      .mockResolvedValueOnce({ data: job("queued") })
+      .mockResolvedValueOnce({ data: job("running", 2) })
+      .mockResolvedValueOnce({ data: job("succeeded", 3) });
+    const onProgress = jest.fn();
+
+    const result = await waitForLessonJob("job-1", "token", onProgress, 0);
+
+    expect(result.lesson_id).toBe("lesson-1");
+    expect(onProgress.mock.calls.map(([polled]) => polled.status)).toEqual([
+      "queued",
+      "running",
+      "succeeded",
+    ]);
+    expect(getLessonJob).toHaveBeenCalledWith(
+      expect.objectContaining({
+        path: { job_id: "job-1" },
+        headers: { Authorization: "Bearer token" },
+      }),
+    );
+  });
+
+  it("should reject with the job error if the render fails", async () => {
+    (getLessonJob as jest.Mock).mockResolvedValueOnce({
+      data: job("failed", 1, "ffmpeg failed"),
+    });
+
+    await expect(waitForLessonJob("job-1", "token", undefined, 0)).rejects.toThrow(
+      "ffmpeg failed",
+    );
+  });
+
+  it("should reject if the job can't be read", async () => {
+    (getLessonJob as jest.Mock).mockResolvedValueOnce({
+      error: { detail: "Job not found: job-1" },
+    });
+
+    await expect(waitForLessonJob("job-1", "token", undefined, 0)).rejects.toThrow(
+      "Job not found: job-1",
+    );
+  });
+});
@@ -6,6 +6,7 @@ import {generateScriptFromPdf, getLessonScenario, updateLesson, uploadScenario}
 import DialogueEditor, {Scenario} from "@/components/ui/DialogueEditor";
 import {LoadingOverlay} from "@/components/ui/LoadingOverlay";
 import {prepareScenarioForBackend} from "@/lib/script-editor";
+import {errorDetail, renderProgressMessage, waitForLessonJob} from "@/lib/lesson-jobs";
 import {useSearchParams} from "next/navigation";
 
 
@@ -124,9 +125,10 @@ function CreateNewLessonPage() {
         const finalScenario = await prepareScenarioForBackend(scenario);
 
         try {
-            if (isEditMode && lessonId) {
+            // Both endpoints only queue the render; the lesson is ready once its job succeeds
+            const response = isEditMode && lessonId
                 // Update existing lesson using PUT endpoint
-                const response = await updateLesson({
+                ? await updateLesson({
                     path: {
                         lesson_id: lessonId
                     },
@@ -135,18 +137,9 @@ function CreateNewLessonPage() {
                         Authorization: `Bearer ${token}`,
                     },
                     baseURL: process.env.NEXT_PUBLIC_API_BASE_URL
-                });
-
-                if (response.data) {
-                    alert("Lesson updated successfully!");
-                    // redirect back to dashboard
-                    window.location.href = "/watch-lesson/" + lessonId;
-                } else {
-                    throw new Error("Update failed - no data returned");
-                }
-            } else {
+                })
                 // Create new lesson
-                const res = await uploadScenario({
+                : await uploadScenario({
                     body: finalScenario,
                     headers: {
                         Authorization: `Bearer ${token}`,
@@ -154,12 +147,17 @@ function CreateNewLessonPage() {
                     baseURL: process.env.NEXT_PUBLIC_API_BASE_URL
                 });
 
-                if (res.data) {
-                    alert("Lesson created successfully!");
-                    // redirect to watch the lesson
-                    window.location.href = `/watch-lesson/${res.data.id}`;
-                }
+            if (!response.data) {
+                throw new Error(errorDetail(response.error) ?? "No render job returned");
             }
+
+            const job = await waitForLessonJob(response.data.id, token, (job) => {
+                setGeneratingScript([true, renderProgressMessage(job)]);
+            });
+
+            alert(isEditMode ? "Lesson updated successfully!" : "Lesson created successfully!");
+            // redirect to watch the lesson
+            window.location.href = `/watch-lesson/${job.lesson_id}`;
         } catch (error) {
             console.error("Error saving lesson:", error);
             const errorMessage = error instanceof Error ? error.message : "Unknown error";
@@ -60,9 +60,17 @@ import type {
   StreamVideoData,
   StreamVideoError,
   StreamVideoResponse,
+  GetVideoPreviewData,
+  GetVideoPreviewError,
+  GetVideoPreviewResponse,
   SynthesizeSpeechData,
   SynthesizeSpeechError,
   SynthesizeSpeechResponse,
+  SynthesizeSpeechStreamData,
+  SynthesizeSpeechStreamError,
+  SynthesizeSpeechStreamResponse,
+  GetTtsCacheStatsError,
+  GetTtsCacheStatsResponse,
   GenerateImageData,
   GenerateImageError,
   GenerateImageResponse,
@@ -75,12 +83,18 @@ import type {
   UploadScenarioData,
   UploadScenarioError,
   UploadScenarioResponse,
+  GetLessonJobData,
+  GetLessonJobError,
+  GetLessonJobResponse,
   UpdateLessonData,
   UpdateLessonError,
   UpdateLessonResponse,
   GetLessonData,
   GetLessonError,
   GetLessonResponse,
+  RerenderLessonData,
+  RerenderLessonError,
+  RerenderLessonResponse,
   AddVideoToLessonData,
   AddVideoToLessonError,
   AddVideoToLessonResponse,
@@ -93,9 +107,18 @@ import type {
   GetLessonScenarioData,
   GetLessonScenarioError,
   GetLessonScenarioResponse,
+  StreamRenderEventsData,
+  StreamRenderEventsError,
+  StreamRenderEventsResponse,
   StreamVideoSegmentData,
   StreamVideoSegmentError,
   StreamVideoSegmentResponse,
+  GetHlsFileData,
+  GetHlsFileError,
+  GetHlsFileResponse,
+  GetLessonPreviewData,
+  GetLessonPreviewError,
+  GetLessonPreviewResponse,
   GenerateScriptFromPdfData,
   GenerateScriptFromPdfError,
   GenerateScriptFromPdfResponse,
@@ -406,6 +429,24 @@ export const streamVideo = <ThrowOnError extends boolean = false>(
   });
 };
 
+/**
+ * Get Video Preview
+ * Serve a preview of a video: poster.jpg, or sprite.jpg with its sprite.vtt scrubbing
+ * index. Like the stream, they're public so <img> and <track> elements can load them.
+ */
+export const getVideoPreview = <ThrowOnError extends boolean = false>(
+  options: OptionsLegacyParser<GetVideoPreviewData, ThrowOnError>,
+) => {
+  return (options?.client ?? client).get<
+    GetVideoPreviewResponse,
+    GetVideoPreviewError,
+    ThrowOnError
+  >({
+    ...options,
+    url: "/videos/{video_id}/previews/{filename}",
+  });
+};
+
 /**
  * Synthesize Speech
  * Generate speech from text using Hume.ai TTS API.
@@ -426,6 +467,44 @@ export const synthesizeSpeech = <ThrowOnError extends boolean = false>(
   });
 };
 
+/**
+ * Synthesize Speech Stream
+ * Stream speech as raw MP3 (audio/mpeg) while Hume generates it.
+ *
+ * - Playback can start with the first chunk instead of after the whole clip
+ * - No base64 inflation, and the server never holds the whole clip in memory
+ * - Identical requests replay from the TTS audio cache; X-TTS-Cache says "hit" or "miss"
+ */
+export const synthesizeSpeechStream = <ThrowOnError extends boolean = false>(
+  options: OptionsLegacyParser<SynthesizeSpeechStreamData, ThrowOnError>,
+) => {
+  return (options?.client ?? client).post<
+    SynthesizeSpeechStreamResponse,
+    SynthesizeSpeechStreamError,
+    ThrowOnError
+  >({
+    ...options,
+    url: "/tts/synthesize/stream",
+  });
+};
+
+/**
+ * Get Tts Cache Stats
+ * Hit/miss counters and disk usage of the TTS audio cache.
+ */
+export const getTtsCacheStats = <ThrowOnError extends boolean = false>(
+  options?: OptionsLegacyParser<unknown, ThrowOnError>,
+) => {
+  return (options?.client ?? client).get<
+    GetTtsCacheStatsResponse,
+    GetTtsCacheStatsError,
+    ThrowOnError
+  >({
+    ...options,
+    url: "/tts/cache/stats",
+  });
+};
+
 /**
  * Generate Image
  * Generate an image using DALL-E based on a text prompt.
@@ -485,6 +564,9 @@ export const createLesson = <ThrowOnError extends boolean = false>(
 
 /**
  * Upload Scenario
+ * Create a lesson from a scenario and queue the rendering of its video segments.
+ *
+ * Returns the render job immediately; poll GET /lessons/jobs/{job_id} for progress.
  */
 export const uploadScenario = <ThrowOnError extends boolean = false>(
   options: OptionsLegacyParser<UploadScenarioData, ThrowOnError>,
@@ -499,30 +581,50 @@ export const uploadScenario = <ThrowOnError extends boolean = false>(
   });
 };
 
+/**
+ * Get Lesson Job
+ * Report the state of a lesson render job and how many of its segments are done.
+ */
+export const getLessonJob = <ThrowOnError extends boolean = false>(
+  options: OptionsLegacyParser<GetLessonJobData, ThrowOnError>,
+) => {
+  return (options?.client ?? client).get<
+    GetLessonJobResponse,
+    GetLessonJobError,
+    ThrowOnError
+  >({
+    ...options,
+    url: "/lessons/jobs/{job_id}",
+  });
+};
+
 /**
  * Update Lesson
- * Update an existing lesson by replacing its scenario and regenerating all video segments.
+ * Update an existing lesson by replacing its scenario and queueing a re-render of the video segments that changed.
  *
  * This endpoint:
  * 1. Validates that the lesson exists and belongs to the current user
- * 2. Deletes all existing video segments from disk
+ * 2. Rejects the update while another render of the lesson is still in progress
  * 3. Updates the lesson title if changed
- * 4. Regenerates all video segments based on the new scenario
- * 5. Updates the scenario JSON in the database
+ * 4. Queues a render job that re-renders only the segments whose dialogue, voice
+ * or image changed, keeping (and renumbering) the unchanged segment files.
+ * Changing the encoder profile re-renders every segment.
+ * The scenario JSON is replaced once the job succeeds.
  *
  * Args:
  * lesson_id: UUID of the lesson to update
  * scenario: New scenario structure with script blocks, breakpoints, and branch options
+ * encoder_profile: Encoder profile to render with, the lesson's current one if omitted
  * db: Database session dependency
  * user: Current authenticated user
  *
  * Returns:
- * Updated lesson information
+ * The queued render job; poll GET /lessons/jobs/{job_id} for progress
  *
  * Raises:
  * 404: If lesson not found
  * 403: If user doesn't own the lesson
- * 500: If video generation or file deletion fails
+ * 409: If the lesson is already being rendered
  */
 export const updateLesson = <ThrowOnError extends boolean = false>(
   options: OptionsLegacyParser<UpdateLessonData, ThrowOnError>,
@@ -553,6 +655,32 @@ export const getLesson = <ThrowOnError extends boolean = false>(
   });
 };
 
+/**
+ * Rerender Lesson
+ * Queue a re-render of the lesson's saved scenario with another encoder profile,
+ * e.g. to publish a lesson that was authored with draft renders.
+ *
+ * Example:
+ * POST /lessons/{lesson_id}/render?encoder_profile=final
+ *
+ * Raises:
+ * 404: If the lesson or its scenario is not found
+ * 403: If user doesn't own the lesson
+ * 409: If the lesson is already being rendered
+ */
+export const rerenderLesson = <ThrowOnError extends boolean = false>(
+  options: OptionsLegacyParser<RerenderLessonData, ThrowOnError>,
+) => {
+  return (options?.client ?? client).post<
+    RerenderLessonResponse,
+    RerenderLessonError,
+    ThrowOnError
+  >({
+    ...options,
+    url: "/lessons/{lesson_id}/render",
+  });
+};
+
 /**
  * Add Video To Lesson
  */
@@ -634,6 +762,32 @@ export const getLessonScenario = <ThrowOnError extends boolean = false>(
   });
 };
 
+/**
+ * Stream Render Events
+ * Stream progress of the lesson's current render as server-sent events.
+ *
+ * Each event is named after its stage (render_queued, render_started, segment_reused,
+ * line_synthesized, tts_finished, segment_encoded, render_finished, render_failed) and carries
+ * a JSON payload with the segment it refers to and the stage timing in elapsed_ms. Events
+ * already emitted by a queued or running render are replayed first; the stream closes when
+ * the render ends.
+ *
+ * Example:
+ * GET /lessons/{lesson_id}/render/events
+ */
+export const streamRenderEvents = <ThrowOnError extends boolean = false>(
+  options: OptionsLegacyParser<StreamRenderEventsData, ThrowOnError>,
+) => {
+  return (options?.client ?? client).get<
+    StreamRenderEventsResponse,
+    StreamRenderEventsError,
+    ThrowOnError
+  >({
+    ...options,
+    url: "/lessons/{lesson_id}/render/events",
+  });
+};
+
 /**
  * Stream Video Segment
  * Stream a video segment for a lesson based on segment number and optional branch type.
@@ -642,12 +796,16 @@ export const getLessonScenario = <ThrowOnError extends boolean = false>(
  * 1. Validates the lesson exists in the database
  * 2. Validates the segment exists in the lesson's scenario JSON
  * 3. Resolves the video file path on disk
- * 4. Streams the MP4 file to the client
+ * 4. Streams the MP4 file to the client, or an M4A (audio/mp4) for segments without an
+ * image; the X-Segment-Media header says "video" or "audio" so the player can show a
+ * placeholder instead of an empty frame
  *
  * Args:
  * lesson_id: UUID of the lesson
  * segment_number: The segment number to retrieve (1-indexed)
  * segment_type: Optional branch identifier (e.g., "option_A", "option_B")
+ * rendition: Optional smaller rendition for slow connections (e.g., "360p", "540p");
+ * served at full size when the lesson has no such rendition
  * db: Database session dependency
  *
  * Returns:
@@ -655,11 +813,12 @@ export const getLessonScenario = <ThrowOnError extends boolean = false>(
  *
  * Raises:
  * 404: If lesson, segment, or video file not found
- * 400: If segment_number is invalid
+ * 400: If segment_number or rendition is invalid
  *
  * Example:
  * GET /lessons/{lesson_id}/segment?segment_number=1
  * GET /lessons/{lesson_id}/segment?segment_number=3&segment_type=option_A
+ * GET /lessons/{lesson_id}/segment?segment_number=1&rendition=360p
  */
 export const streamVideoSegment = <ThrowOnError extends boolean = false>(
   options: OptionsLegacyParser<StreamVideoSegmentData, ThrowOnError>,
@@ -674,6 +833,56 @@ export const streamVideoSegment = <ThrowOnError extends boolean = false>(
   });
 };
 
+/**
+ * Get Hls File
+ * Serve the HLS playlists and fMP4 fragments of a lesson.
+ *
+ * Each track ("main" or a branch type such as "option_A") has a playlist.m3u8 that
+ * references its init sections and .m4s fragments by relative name. The files are
+ * static, so nginx or a CDN can serve lessons/<id>/hls/ directly instead.
+ *
+ * Example:
+ * GET /lessons/{lesson_id}/hls/main/playlist.m3u8
+ * GET /lessons/{lesson_id}/hls/option_A/playlist.m3u8
+ */
+export const getHlsFile = <ThrowOnError extends boolean = false>(
+  options: OptionsLegacyParser<GetHlsFileData, ThrowOnError>,
+) => {
+  return (options?.client ?? client).get<
+    GetHlsFileResponse,
+    GetHlsFileError,
+    ThrowOnError
+  >({
+    ...options,
+    url: "/lessons/{lesson_id}/hls/{track}/{filename}",
+  });
+};
+
+/**
+ * Get Lesson Preview
+ * Serve the preview images of a rendered lesson, so lesson lists don't fetch any video.
+ *
+ * Each segment with an image has a poster named after it (segment_main_001.jpg), and each
+ * track ("main" or a branch type) has a thumbnail sprite sheet with a WebVTT index for
+ * scrubbing, one tile per segment. The VTT references the sheet by relative name.
+ *
+ * Example:
+ * GET /lessons/{lesson_id}/previews/segment_main_001.jpg
+ * GET /lessons/{lesson_id}/previews/main_sprite.vtt
+ */
+export const getLessonPreview = <ThrowOnError extends boolean = false>(
+  options: OptionsLegacyParser<GetLessonPreviewData, ThrowOnError>,
+) => {
+  return (options?.client ?? client).get<
+    GetLessonPreviewResponse,
+    GetLessonPreviewError,
+    ThrowOnError
+  >({
+    ...options,
+    url: "/lessons/{lesson_id}/previews/{filename}",
+  });
+};
+
 /**
  * Generate Script From Pdf
  * Accept a PDF upload and return a 2-minute teaching script.
@@ -88,6 +88,18 @@ export type LessonCreate = {
   user_id: string;
 };
 
+export type LessonJobRead = {
+  id: string;
+  lesson_id: string;
+  status: string;
+  segments_done: number;
+  segments_total: number;
+  error?: string | null;
+  encoder_profile: string;
+  created_at: string;
+  updated_at: string;
+};
+
 export type LessonListResponse = {
   items: Array<LessonRead>;
   total: number;
@@ -101,6 +113,7 @@ export type LessonRead = {
   id: string;
   created_at: string;
   user_id: string;
+  encoder_profile: string;
 };
 
 export type LessonVideoAddResponse = {
@@ -229,6 +242,7 @@ export type VideoGenerateRequest = {
   images: TTImageRequest;
   lesson_id: string;
   title: string | null;
+  encoder_profile?: "draft" | "standard" | "final" | null;
 };
 
 export type VideoRead = {
@@ -403,6 +417,17 @@ export type StreamVideoResponse = unknown;
 
 export type StreamVideoError = HTTPValidationError;
 
+export type GetVideoPreviewData = {
+  path: {
+    filename: string;
+    video_id: string;
+  };
+};
+
+export type GetVideoPreviewResponse = unknown;
+
+export type GetVideoPreviewError = HTTPValidationError;
+
 export type SynthesizeSpeechData = {
   body: TTSRequest;
 };
@@ -411,6 +436,20 @@ export type SynthesizeSpeechResponse = TTSResponse;
 
 export type SynthesizeSpeechError = HTTPValidationError;
 
+export type SynthesizeSpeechStreamData = {
+  body: TTSRequest;
+};
+
+export type SynthesizeSpeechStreamResponse = unknown;
+
+export type SynthesizeSpeechStreamError = HTTPValidationError;
+
+export type GetTtsCacheStatsResponse = {
+  [key: string]: number;
+};
+
+export type GetTtsCacheStatsError = unknown;
+
 export type GenerateImageData = {
   body: TTImageRequest;
 };
@@ -448,20 +487,42 @@ export type CreateLessonError = HTTPValidationError;
 
 export type UploadScenarioData = {
   body: Scenario;
+  query?: {
+    /**
+     * Encoder profile: 'draft' for fast previews, 'standard', or 'final' for small published files
+     */
+    encoder_profile?: "draft" | "standard" | "final" | null;
+  };
 };
 
-export type UploadScenarioResponse = LessonRead;
+export type UploadScenarioResponse = LessonJobRead;
 
 export type UploadScenarioError = HTTPValidationError;
 
+export type GetLessonJobData = {
+  path: {
+    job_id: string;
+  };
+};
+
+export type GetLessonJobResponse = LessonJobRead;
+
+export type GetLessonJobError = HTTPValidationError;
+
 export type UpdateLessonData = {
   body: Scenario;
   path: {
     lesson_id: string;
   };
+  query?: {
+    /**
+     * Encoder profile: 'draft' for fast previews, 'standard', or 'final' for small published files; defaults to the lesson's current profile
+     */
+    encoder_profile?: "draft" | "standard" | "final" | null;
+  };
 };
 
-export type UpdateLessonResponse = LessonRead;
+export type UpdateLessonResponse = LessonJobRead;
 
 export type UpdateLessonError = HTTPValidationError;
 
@@ -475,6 +536,22 @@ export type GetLessonResponse = LessonRead;
 
 export type GetLessonError = HTTPValidationError;
 
+export type RerenderLessonData = {
+  path: {
+    lesson_id: string;
+  };
+  query: {
+    /**
+     * Encoder profile: 'draft' for fast previews, 'standard', or 'final' for small published files
+     */
+    encoder_profile: "draft" | "standard" | "final";
+  };
+};
+
+export type RerenderLessonResponse = LessonJobRead;
+
+export type RerenderLessonError = HTTPValidationError;
+
 export type AddVideoToLessonData = {
   body: LessonVideoAddResponse;
   path: {
@@ -520,11 +597,25 @@ export type GetLessonScenarioResponse = unknown;
 
 export type GetLessonScenarioError = HTTPValidationError;
 
+export type StreamRenderEventsData = {
+  path: {
+    lesson_id: string;
+  };
+};
+
+export type StreamRenderEventsResponse = unknown;
+
+export type StreamRenderEventsError = HTTPValidationError;
+
 export type StreamVideoSegmentData = {
   path: {
     lesson_id: string;
   };
   query: {
+    /**
+     * Smaller rendition (e.g., '360p') or None for full size
+     */
+    rendition?: string | null;
     /**
      * The segment number (1-indexed)
      */
@@ -540,6 +631,29 @@ export type StreamVideoSegmentResponse = unknown;
 
 export type StreamVideoSegmentError = HTTPValidationError;
 
+export type GetHlsFileData = {
+  path: {
+    filename: string;
+    lesson_id: string;
+    track: string;
+  };
+};
+
+export type GetHlsFileResponse = unknown;
+
+export type GetHlsFileError = HTTPValidationError;
+
+export type GetLessonPreviewData = {
+  path: {
+    filename: string;
+    lesson_id: string;
+  };
+};
+
+export type GetLessonPreviewResponse = unknown;
+
+export type GetLessonPreviewError = HTTPValidationError;
+
 export type GenerateScriptFromPdfData = {
   body: Body_genscript_generate_script_from_pdf;
 };
@@ -0,0 +1,51 @@
+import {getLessonJob, LessonJobRead} from "@/app/openapi-client";
+
+const POLL_INTERVAL_MS = 2000;
+
+/**
+ * Poll a lesson render job until it finishes.
+ * onProgress is called with every polled state, e.g. to show how many segments are done.
+ * Resolves with the succeeded job, and rejects with the job's error if the render failed.
+ */
+export async function waitForLessonJob(
+    jobId: string,
+    token: string,
+    onProgress?: (job: LessonJobRead) => void,
+    intervalMs: number = POLL_INTERVAL_MS,
+): Promise<LessonJobRead> {
+    while (true) {
+        const response = await getLessonJob({
+            path: {
+                job_id: jobId
+            },
+            headers: {
+                Authorization: `Bearer ${token}`,
+            },
+            baseURL: process.env.NEXT_PUBLIC_API_BASE_URL
+        });
+
+        const job = response.data;
+        if (!job) {
+            throw new Error(errorDetail(response.error) ?? "Render job not found");
+        }
+        onProgress?.(job);
+
+        if (job.status === "succeeded") return job;
+        if (job.status === "failed") throw new Error(job.error || "Rendering failed");
+
+        await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+}
+
+/**
+ * The detail message of a FastAPI error response, e.g. the 409 for a lesson that is still rendering
+ */
+export function errorDetail(error: unknown): string | undefined {
+    const detail = (error as { detail?: unknown } | undefined)?.detail;
+    return typeof detail === "string" ? detail : undefined;
+}
+
+export function renderProgressMessage(job: LessonJobRead): string {
+    if (!job.segments_total) return "Rendering video...";
+    return `Rendering video... ${job.segments_done}/${job.segments_total} segments`;
+}